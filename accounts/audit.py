@@ -0,0 +1,69 @@
+"""
+Audit trail helpers.
+Keeps AuditEvent writes off the critical path of the request's own writes.
+"""
+from django.db import transaction
+from django.utils.deprecation import MiddlewareMixin
+import logging
+from .models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+
+def record_audit_event(**fields):
+    """
+    Record an AuditEvent once the current transaction commits.
+    Outside an atomic block the event is written immediately. A failing
+    audit write is logged by Django rather than failing the request.
+    """
+    transaction.on_commit(lambda: AuditEvent.objects.create(**fields), robust=True)
+
+
+def buffer_audit_event(request, **fields):
+    """
+    Queue an AuditEvent on the request so AuditBufferMiddleware can write it
+    after the response is sent. Falls back to record_audit_event when the
+    request is missing or not buffered (e.g. signals fired outside a request).
+    
+    Buffered events live only in the worker's memory until the response is
+    closed, so they are lost if the worker dies first; events that must not
+    be lost (such as password changes) should use record_audit_event.
+    """
+    events = getattr(request, 'audit_events', None)
+    if events is None:
+        record_audit_event(**fields)
+    else:
+        events.append(AuditEvent(**fields))
+
+
+class AuditBufferMiddleware(MiddlewareMixin):
+    """
+    Middleware that collects the audit events buffered during a request and
+    writes them with a single bulk_create once the response has been sent.
+    """
+
+    def process_request(self, request):
+        request.audit_events = []
+
+    def process_response(self, request, response):
+        events = getattr(request, 'audit_events', None)
+        if events:
+            # The server calls close() once the body has been delivered to
+            # the client, so the flush runs after the response is sent
+            close = response.close
+
+            def close_and_flush():
+                try:
+                    close()
+                finally:
+                    self.flush(events)
+
+            response.close = close_and_flush
+        return response
+
+    @staticmethod
+    def flush(events):
+        try:
+            AuditEvent.objects.bulk_create(events)
+        except Exception as e:
+            logger.error(f"Error writing {len(events)} buffered audit events: {e}")
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=models.Index(fields=['user', 'event', '-created_at'], name='audit_user_event_ct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=models.Index(fields=['-created_at'], name='audit_created_at_idx'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.contrib.auth.models import AbstractUser, Group
+from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.text import slugify
 
@@ -83,12 +83,12 @@ class Membership(models.Model):
         Sync user's group membership based on their roles.
         Adds user to Django group corresponding to their role.
         """
-        try:
-            group = Group.objects.get(name=self.role)
-            self.user.groups.add(group)
-        except Group.DoesNotExist:
-            # Group will be created by management command
-            pass
+        from .permissions import group_id
+
+        role_group_id = group_id(self.role)
+        if role_group_id is not None:
+            self.user.groups.add(role_group_id)
+        # Otherwise the group will be created by management command
 
 
 class AuditEvent(models.Model):
@@ -122,6 +122,10 @@ class AuditEvent(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'event', '-created_at'], name='audit_user_event_ct_idx'),
+            models.Index(fields=['-created_at'], name='audit_created_at_idx'),
+        ]
         verbose_name = "Audit Event"
         verbose_name_plural = "Audit Events"
 
@@ -1,12 +1,28 @@
 from functools import wraps
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
-from django.shortcuts import get_object_or_404
+from django.shortcuts import get_object_or_404, redirect
 from rest_framework import permissions
 from rest_framework.exceptions import PermissionDenied as DRFPermissionDenied
 from .models import Membership, Organization, Role, AuditEvent
 
+User = get_user_model()
+
+# Seconds a user's resolved permission list and the group name -> ID map stay
+# cached. Entries are also dropped by the invalidation signals in
+# accounts.signals, but only in the cache the changing process can reach: with
+# the per-process default cache, other workers may serve stale permissions for
+# up to this long. See USER_PERMISSIONS_CACHE_TIMEOUT in settings.
+USER_PERMISSIONS_CACHE_TIMEOUT = getattr(settings, 'USER_PERMISSIONS_CACHE_TIMEOUT', 30)
+
+GROUP_IDS_CACHE_KEY = 'group_ids'
+
 
 def get_client_ip(request):
     """Extract client IP address from request."""
@@ -164,6 +180,90 @@ def employer_admin_required(view_func):
     return requires_role(Role.SUPERUSER, Role.BROKER_ADMIN, Role.EMPLOYER_ADMIN)(view_func)
 
 
+def user_groups(user):
+    """
+    Return the set of group names the user belongs to.
+    The set is cached on the user object for the lifetime of the request.
+    """
+    try:
+        return user._group_names
+    except AttributeError:
+        user._group_names = frozenset(user.groups.values_list('name', flat=True))
+        return user._group_names
+
+
+def group_id(name):
+    """
+    Return the primary key of the named group, or None if it does not exist.
+    Found IDs are kept in a shared name -> ID map in the cache, which the
+    Group save/delete signals in accounts.signals clear.
+    """
+    group_ids = cache.get(GROUP_IDS_CACHE_KEY) or {}
+    try:
+        return group_ids[name]
+    except KeyError:
+        pk = Group.objects.filter(name=name).values_list('pk', flat=True).first()
+        if pk is not None:
+            group_ids[name] = pk
+            cache.set(GROUP_IDS_CACHE_KEY, group_ids, USER_PERMISSIONS_CACHE_TIMEOUT)
+        return pk
+
+
+def forget_group_ids():
+    """Clear the cached group name -> ID map."""
+    cache.delete(GROUP_IDS_CACHE_KEY)
+
+
+def is_broker_admin(user):
+    """True if the user is a superuser or a Broker Admin."""
+    return user.is_superuser or 'Broker Admin' in user_groups(user)
+
+
+def require_roles(*group_names):
+    """
+    Decorator for dashboard views that requires the user to be a superuser
+    or a member of one of the named groups. Redirects to the dashboard otherwise.
+    """
+    allowed = frozenset(group_names)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not (request.user.is_superuser or user_groups(request.user) & allowed):
+                messages.error(request, 'You do not have permission to access this page.')
+                return redirect('dashboard')
+            return view_func(request, *args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def user_permissions_cache_key(user_id):
+    """Cache key for a user's resolved permission list."""
+    return f'user_perms:{user_id}'
+
+
+def get_cached_user_permissions(user_id):
+    """
+    Return the sorted list of permission strings for a user, or None if the
+    user does not exist. Results are cached per user.
+    """
+    key = user_permissions_cache_key(user_id)
+    permissions_list = cache.get(key)
+    if permissions_list is None:
+        user = User.objects.filter(id=user_id).first()
+        if user is None:
+            return None
+        permissions_list = sorted(user.get_all_permissions())
+        cache.set(key, permissions_list, USER_PERMISSIONS_CACHE_TIMEOUT)
+    return permissions_list
+
+
+def invalidate_user_permissions(user_ids):
+    """Drop cached permission lists for the given user IDs."""
+    cache.delete_many([user_permissions_cache_key(user_id) for user_id in user_ids])
+
+
 # DRF Permission Classes
 
 class IsInOrganization(permissions.BasePermission):
@@ -1,10 +1,13 @@
 from django.contrib.auth.signals import user_logged_in, user_logged_out
-from django.db.models.signals import post_save, post_delete
+from django.contrib.auth.models import Group
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
 from allauth.account.signals import user_signed_up, email_confirmed
 from allauth.socialaccount.signals import social_account_added, social_account_removed
 from django.contrib.auth import get_user_model
 from .models import AuditEvent, Membership, Organization, Role
+from .audit import buffer_audit_event
+from .permissions import forget_group_ids, invalidate_user_permissions
 
 User = get_user_model()
 
@@ -33,7 +36,8 @@ def log_user_login(sender, request, user, **kwargs):
     """
     Log user login events for audit trail.
     """
-    AuditEvent.objects.create(
+    buffer_audit_event(
+        request,
         user=user,
         event='login',
         ip_address=get_client_ip(request),
@@ -51,7 +55,8 @@ def log_user_logout(sender, request, user, **kwargs):
     Log user logout events for audit trail.
     """
     if user and hasattr(user, 'email'):  # user might be AnonymousUser
-        AuditEvent.objects.create(
+        buffer_audit_event(
+            request,
             user=user,
             event='logout',
             ip_address=get_client_ip(request),
@@ -75,7 +80,8 @@ def handle_user_signup(sender, request, user, **kwargs):
     # In production, this should be invitation-based
     
     # Create audit event (already handled by adapters, but keeping for completeness)
-    AuditEvent.objects.create(
+    buffer_audit_event(
+        request,
         user=user,
         event='signup',
         ip_address=get_client_ip(request),
@@ -95,7 +101,8 @@ def handle_email_confirmation(sender, request, email_address, **kwargs):
     """
     user = email_address.user
     
-    AuditEvent.objects.create(
+    buffer_audit_event(
+        request,
         user=user,
         event='email_verified',
         ip_address=get_client_ip(request),
@@ -114,7 +121,8 @@ def handle_social_account_added(sender, request, sociallogin, **kwargs):
     """
     user = sociallogin.user
     
-    AuditEvent.objects.create(
+    buffer_audit_event(
+        request,
         user=user,
         event='social_account_added',
         ip_address=get_client_ip(request),
@@ -134,7 +142,8 @@ def handle_social_account_removed(sender, request, socialaccount, **kwargs):
     """
     user = socialaccount.user
     
-    AuditEvent.objects.create(
+    buffer_audit_event(
+        request,
         user=user,
         event='social_account_removed',
         ip_address=get_client_ip(request),
@@ -199,4 +208,61 @@ def handle_membership_deleted(sender, instance, **kwargs):
             'organization': instance.organization.name,
             'user_email': instance.user.email
         }
-    )
\ No newline at end of file
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_permissions_on_user_change(sender, instance, **kwargs):
+    """
+    Drop the user's cached permissions (is_active/is_superuser affect them).
+    """
+    invalidate_user_permissions([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_permissions_on_assignment(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drop cached permissions when a user's groups or direct permissions change.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        invalidate_user_permissions([instance.pk])
+    elif pk_set:
+        invalidate_user_permissions(pk_set)
+    else:
+        # Clearing from the group/permission side: affected users are still linked
+        invalidate_user_permissions(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_permissions_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drop cached permissions for every member of a group whose permissions change.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        group_ids = [instance.pk]
+    else:
+        group_ids = pk_set or instance.group_set.values_list('pk', flat=True)
+    invalidate_user_permissions(User.objects.filter(groups__in=group_ids).values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Group)
+def invalidate_permissions_on_group_delete(sender, instance, **kwargs):
+    """
+    Drop cached permissions for members of a group that is being deleted.
+    """
+    invalidate_user_permissions(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def forget_group_ids_on_group_change(sender, **kwargs):
+    """
+    Drop the cached group name -> ID map when a group is created, renamed or deleted.
+    """
+    forget_group_ids()
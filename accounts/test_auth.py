@@ -573,6 +573,404 @@ class AdminIntegrationTestCase(TestCase):
         self.assertContains(response, 'admin@test.com')
 
 
+class RequireRolesTestCase(TestCase):
+    """Test the require_roles dashboard guard."""
+
+    def setUp(self):
+        """Set up a plain user and the Broker Admin group."""
+        self.user = User.objects.create(
+            email='guard@test.com',
+            first_name='Guard',
+            last_name='User'
+        )
+        self.broker_group = Group.objects.create(name='Broker Admin')
+        self.client.force_login(self.user)
+
+    def test_user_without_group_is_redirected(self):
+        """Test that users outside the required groups are sent to the dashboard."""
+        response = self.client.get(reverse('onboarding_wizard'))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+
+    def test_user_in_group_is_allowed(self):
+        """Test that members of a required group reach the view."""
+        self.user.groups.add(self.broker_group)
+        response = self.client.get(reverse('onboarding_wizard'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_user_groups_is_cached_per_user(self):
+        """Test that group names are only queried once per user object."""
+        from .permissions import user_groups
+
+        self.user.groups.add(self.broker_group)
+        with self.assertNumQueries(1):
+            self.assertIn('Broker Admin', user_groups(self.user))
+            self.assertIn('Broker Admin', user_groups(self.user))
+
+    def test_group_id_is_cached_until_groups_change(self):
+        """Test that group IDs are resolved once and refreshed when groups change."""
+        from .permissions import group_id
+
+        with self.assertNumQueries(1):
+            self.assertEqual(group_id('Broker Admin'), self.broker_group.id)
+            self.assertEqual(group_id('Broker Admin'), self.broker_group.id)
+
+        self.broker_group.name = 'Brokers'
+        self.broker_group.save()
+        self.assertIsNone(group_id('Broker Admin'))
+        self.assertEqual(group_id('Brokers'), self.broker_group.id)
+
+    def test_guard_and_sidebar_share_one_group_query(self):
+        """Test that the guard and the sidebar role checks reuse one group lookup."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.user.groups.add(self.broker_group)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('onboarding_wizard'))
+        self.assertContains(response, reverse('employers'))
+        group_queries = [q for q in ctx.captured_queries if '"auth_group"' in q['sql']]
+        self.assertEqual(len(group_queries), 1)
+
+
+class CountQuerysetsTestCase(TestCase):
+    """Test the single-roundtrip dashboard counter."""
+
+    def test_counts_in_one_query(self):
+        """Test that several filtered counts are returned from one query."""
+        from .views import count_querysets
+
+        user = User.objects.create(email='counter@test.com', first_name='C', last_name='U')
+        Organization.objects.create(name='Counted Org')
+        AuditEvent.objects.create(user=user, event='login')
+        AuditEvent.objects.create(user=user, event='logout')
+
+        with self.assertNumQueries(1):
+            counts = count_querysets(
+                users=User.objects.all(),
+                organizations=Organization.objects.all(),
+                logins=AuditEvent.objects.filter(event='login'),
+            )
+        self.assertEqual(counts, {'users': 1, 'organizations': 1, 'logins': 1})
+
+
+class RecordAuditEventTestCase(TestCase):
+    """Test deferred audit event recording."""
+
+    def test_event_written_on_commit(self):
+        """Test that the audit event is only written once the transaction commits."""
+        from .audit import record_audit_event
+
+        user = User.objects.create(email='audited@test.com', first_name='A', last_name='U')
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            record_audit_event(user=user, event='password_change', metadata={'method': 'api'})
+            self.assertFalse(AuditEvent.objects.filter(event='password_change').exists())
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertTrue(AuditEvent.objects.filter(user=user, event='password_change').exists())
+
+
+class TokenLoginTestCase(TestCase):
+    """Test the JWT login endpoint."""
+
+    def test_login_returns_authenticated_user(self):
+        """Test that login reuses the authenticated user without re-querying by email."""
+        user = User.objects.create(email='jwt@test.com', first_name='Jwt', last_name='User')
+        user.set_password('TestPass123!')
+        user.save()
+
+        response = self.client.post(
+            reverse('accounts:token_obtain_pair'),
+            {'email': 'jwt@test.com', 'password': 'TestPass123!'},
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['id'], user.id)
+        self.assertEqual(response.json()['organizations'], [])
+
+    def test_login_includes_memberships(self):
+        """Test that the login response lists the user's organizations and roles."""
+        user = User.objects.create(email='member@test.com', first_name='M', last_name='U')
+        user.set_password('TestPass123!')
+        user.save()
+        organization = Organization.objects.create(name='Member Org')
+        Membership.objects.create(user=user, organization=organization, role=Role.EMPLOYEE)
+
+        response = self.client.post(
+            reverse('accounts:token_obtain_pair'),
+            {'email': 'member@test.com', 'password': 'TestPass123!'},
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.json()['organizations'], [
+            {'id': organization.id, 'name': 'Member Org', 'role': Role.EMPLOYEE}
+        ])
+
+
+class EmployerFormsViewTestCase(TestCase):
+    """Test the employer form submission review dashboard."""
+
+    def setUp(self):
+        """Set up an employer with submissions in several states."""
+        from datetime import date
+        from broker_console.models import Broker, Employer, EmployeeFormSubmission
+
+        broker = Broker.objects.create(agency_name='Test Agency')
+        self.employer = Employer.objects.create(
+            broker=broker, name='Acme', ein='12-3456789', size=10, effective_date=date(2025, 1, 1)
+        )
+        for index, submission_status in enumerate(['pending', 'pending', 'approved', 'rejected']):
+            EmployeeFormSubmission.objects.create(
+                employer=self.employer, first_name=f'Emp{index}', last_name='Test',
+                email=f'emp{index}@acme.com', date_of_birth=date(1990, 1, 1), ssn='000-00-0000',
+                address_line1='1 Main St', city='City', state='ST', zip_code='12345',
+                hire_date=date(2025, 1, 1), salary=50000, status=submission_status
+            )
+        self.user = User.objects.create(email='reviewer@test.com', first_name='R', last_name='V', is_superuser=True)
+        self.client.force_login(self.user)
+
+    def test_stats_and_pagination_share_one_count(self):
+        """Test that stats are aggregated once and reused as the paginator count."""
+        response = self.client.get(reverse('employer_forms', args=[self.employer.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['stats'], {
+            'total_submissions': 4,
+            'pending_submissions': 2,
+            'approved_submissions': 1,
+            'rejected_submissions': 1,
+        })
+        self.assertEqual(response.context['submissions'].paginator.count, 4)
+        self.assertEqual(len(response.context['submissions'].object_list), 4)
+
+    def test_list_defers_unrendered_columns(self):
+        """Test that the submission list does not load columns the template never shows."""
+        response = self.client.get(reverse('employer_forms', args=[self.employer.id]))
+
+        submission = response.context['submissions'].object_list[0]
+        self.assertIn('ssn', submission.get_deferred_fields())
+        self.assertNotIn('email', submission.get_deferred_fields())
+
+    def test_unknown_employer_redirects(self):
+        """Test that a missing employer redirects back to the employer list."""
+        import uuid
+
+        response = self.client.get(reverse('employer_forms', args=[uuid.uuid4()]))
+        self.assertRedirects(response, reverse('employers'), fetch_redirect_response=False)
+
+
+class CreatePlanTemplatesTestCase(TestCase):
+    """Test the onboarding wizard's plan template endpoint."""
+
+    def setUp(self):
+        """Set up two employers and a logged-in superuser."""
+        from datetime import date
+        from django.core.cache import cache
+        from broker_console.models import Broker, Employer
+
+        cache.clear()
+        broker = Broker.objects.create(agency_name='Test Agency')
+        self.employer = Employer.objects.create(
+            broker=broker, name='Acme', ein='12-3456789', size=10, effective_date=date(2025, 1, 1)
+        )
+        self.other_employer = Employer.objects.create(
+            broker=broker, name='Globex', ein='98-7654321', size=10, effective_date=date(2025, 1, 1)
+        )
+        self.user = User.objects.create(email='broker@test.com', first_name='B', last_name='A', is_superuser=True)
+        self.client.force_login(self.user)
+
+    def create_templates(self, employer, selected_plans):
+        """POST the selected template keys for the employer."""
+        return self.client.post(
+            reverse('create_plan_templates'),
+            {'employer_id': str(employer.id), 'selected_plans': selected_plans},
+            content_type='application/json'
+        )
+
+    def test_templates_create_plans_premiums_and_offerings(self):
+        """Test that each selected template becomes a plan with premiums offered to the employer."""
+        from broker_console.models import EmployerOffering, Plan, PlanPremium
+
+        response = self.create_templates(self.employer, ['medical_hmo', 'dental_enhanced', 'disability_ltd', 'unknown'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted((plan['name'], plan['type'], plan['carrier']) for plan in response.json()['created_plans']),
+            [('Enhanced Dental', 'dental', 'Anthem'), ('HMO Select', 'medical', 'Aetna'),
+             ('Long-Term Disability', 'disability', 'Aetna')]
+        )
+        hmo = Plan.objects.get(external_code='TPL-MED-HMO')
+        self.assertEqual(
+            dict(PlanPremium.objects.filter(plan=hmo).values_list('coverage_tier', 'monthly_premium')),
+            {'employee_only': 150, 'family': 450}
+        )
+        self.assertEqual(EmployerOffering.objects.filter(employer=self.employer).count(), 3)
+        self.assertTrue(AuditEvent.objects.filter(event='plan_templates_created').exists())
+
+    def test_templates_are_shared_and_not_offered_twice(self):
+        """Test that repeat selections reuse the template plans without duplicating offerings."""
+        from broker_console.models import EmployerOffering, Plan
+
+        self.create_templates(self.employer, ['medical_ppo'])
+        response = self.create_templates(self.employer, ['medical_ppo', 'medical_ppo'])
+        self.assertEqual(response.status_code, 200)
+        response = self.create_templates(self.other_employer, ['medical_ppo'])
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(Plan.objects.filter(external_code='TPL-MED-PPO').count(), 1)
+        self.assertEqual(EmployerOffering.objects.filter(employer=self.employer).count(), 1)
+        self.assertEqual(EmployerOffering.objects.filter(employer=self.other_employer).count(), 1)
+
+    def test_shared_plan_is_priced_from_each_employers_effective_date(self):
+        """Test that an earlier-starting employer gets premiums ending where the existing ones begin."""
+        from datetime import date
+        from broker_console.models import PlanPremium
+
+        self.other_employer.effective_date = date(2024, 7, 1)
+        self.other_employer.save()
+        self.create_templates(self.employer, ['medical_hmo'])
+        self.create_templates(self.other_employer, ['medical_hmo'])
+        self.create_templates(self.other_employer, ['medical_hmo'])
+
+        self.assertEqual(
+            list(PlanPremium.objects.filter(plan__external_code='TPL-MED-HMO').order_by(
+                'coverage_tier', 'effective_date'
+            ).values_list('coverage_tier', 'effective_date', 'end_date')),
+            [('employee_only', date(2024, 7, 1), date(2024, 12, 31)), ('employee_only', date(2025, 1, 1), None),
+             ('family', date(2024, 7, 1), date(2024, 12, 31)), ('family', date(2025, 1, 1), None)]
+        )
+
+    def test_non_broker_is_denied(self):
+        """Test that users who are not broker admins cannot create plans."""
+        self.user.is_superuser = False
+        self.user.save()
+
+        response = self.create_templates(self.employer, ['medical_hmo'])
+        self.assertEqual(response.status_code, 403)
+
+
+class AuditBufferMiddlewareTestCase(TestCase):
+    """Test request-scoped buffering of audit events."""
+
+    def test_logout_event_written_after_response(self):
+        """Test that buffered auth events are flushed once the response is closed."""
+        user = User.objects.create(email='buffered@test.com', first_name='B', last_name='U')
+        self.client.force_login(user)
+
+        self.client.post(reverse('account_logout'))
+
+        self.assertTrue(AuditEvent.objects.filter(user=user, event='logout').exists())
+
+    def test_events_flushed_when_response_closes(self):
+        """Test that buffered events are written by the response's close(), not before."""
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from .audit import AuditBufferMiddleware, buffer_audit_event
+
+        user = User.objects.create(email='closed@test.com', first_name='C', last_name='U')
+
+        def get_response(request):
+            buffer_audit_event(request, user=user, event='login')
+            return HttpResponse()
+
+        response = AuditBufferMiddleware(get_response)(RequestFactory().get('/'))
+        self.assertFalse(AuditEvent.objects.filter(user=user, event='login').exists())
+        response.close()
+        self.assertTrue(AuditEvent.objects.filter(user=user, event='login').exists())
+
+    def test_flush_writes_events_in_one_query(self):
+        """Test that buffered events are written with a single bulk INSERT."""
+        from .audit import AuditBufferMiddleware
+
+        user = User.objects.create(email='bulk@test.com', first_name='B', last_name='U')
+        events = [AuditEvent(user=user, event='login'), AuditEvent(user=user, event='logout')]
+        with self.assertNumQueries(1):
+            AuditBufferMiddleware.flush(events)
+        self.assertEqual(AuditEvent.objects.filter(user=user).count(), 2)
+
+
+class AuditLogListViewTestCase(TestCase):
+    """Test the bounded audit log listing."""
+
+    def setUp(self):
+        """Set up a user with one recent and one old audit event."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        self.user = User.objects.create(email='auditor@test.com', first_name='A', last_name='U')
+        AuditEvent.objects.create(user=self.user, event='login')
+        old_event = AuditEvent.objects.create(user=self.user, event='logout')
+        AuditEvent.objects.filter(pk=old_event.pk).update(created_at=timezone.now() - timedelta(days=30))
+        self.client.force_login(self.user)
+
+    def test_unfiltered_listing_is_limited_to_recent_window(self):
+        """Test that an unfiltered request only returns the last week of events."""
+        response = self.client.get(reverse('accounts:audit-logs'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(response.json()['results'][0]['event'], 'login')
+
+    def test_filtered_listing_is_not_windowed(self):
+        """Test that filtering by user returns the full history."""
+        response = self.client.get(reverse('accounts:audit-logs'), {'user_id': self.user.id})
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_limit_is_capped(self):
+        """Test that the page size cannot exceed max_limit."""
+        from .views import AuditLogPagination
+
+        AuditEvent.objects.create(user=self.user, event='password_change')
+        with patch.object(AuditLogPagination, 'max_limit', 1):
+            response = self.client.get(reverse('accounts:audit-logs'), {'limit': 100000})
+        self.assertEqual(response.json()['count'], 2)
+        self.assertEqual(len(response.json()['results']), 1)
+
+
+class CachedUserPermissionsTestCase(TestCase):
+    """Test the cached user permission lookup and its invalidation."""
+
+    def setUp(self):
+        """Set up a user and a group carrying one permission."""
+        from django.contrib.auth.models import Permission
+        from django.core.cache import cache
+
+        cache.clear()
+        self.user = User.objects.create(email='perms@test.com', first_name='P', last_name='U')
+        self.group = Group.objects.create(name='Auditors')
+        self.group.permissions.add(Permission.objects.get(codename='view_auditevent'))
+
+    def test_permissions_are_cached(self):
+        """Test that a warm lookup does not hit the database."""
+        from .permissions import get_cached_user_permissions
+
+        self.assertEqual(get_cached_user_permissions(self.user.id), [])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_user_permissions(self.user.id), [])
+
+    def test_group_membership_change_invalidates_cache(self):
+        """Test that adding the user to a group refreshes the cached permissions."""
+        from .permissions import get_cached_user_permissions
+
+        self.assertEqual(get_cached_user_permissions(self.user.id), [])
+        self.user.groups.add(self.group)
+        self.assertEqual(get_cached_user_permissions(self.user.id), ['accounts.view_auditevent'])
+
+    def test_group_permission_change_invalidates_cache(self):
+        """Test that changing a group's permissions refreshes its members' cached permissions."""
+        from .permissions import get_cached_user_permissions
+
+        self.user.groups.add(self.group)
+        self.assertEqual(get_cached_user_permissions(self.user.id), ['accounts.view_auditevent'])
+        self.group.permissions.clear()
+        self.assertEqual(get_cached_user_permissions(self.user.id), [])
+
+    def test_missing_user_returns_none(self):
+        """Test that an unknown user ID is reported as missing."""
+        from .permissions import get_cached_user_permissions
+
+        self.assertIsNone(get_cached_user_permissions(999999))
+
+
 if __name__ == '__main__':
     import django
     from django.conf import settings
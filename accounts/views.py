@@ -1,5 +1,6 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -7,10 +8,19 @@ from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.decorators import method_decorator
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from .models import Organization, Membership, AuditEvent, UserProfile
+from .audit import record_audit_event
+from .permissions import get_cached_user_permissions
+from .serializers import (
+    UserListSerializer, UserDetailSerializer, OrganizationListSerializer, OrganizationDetailSerializer,
+    GroupListSerializer, GroupDetailSerializer, PermissionSerializer, AuditEventSerializer,
+)
+from datetime import timedelta
 import json
 
 User = get_user_model()
@@ -37,33 +47,32 @@ class CustomTokenObtainPairView(TokenObtainPairView):
         response = super().post(request, *args, **kwargs)
         
         if response.status_code == 200:
-            # Get user from email
-            email = request.data.get('email')
-            try:
-                user = User.objects.get(email=email)
-                response.data['user'] = {
-                    'id': user.id,
-                    'email': user.email,
-                    'first_name': user.first_name,
-                    'last_name': user.last_name,
-                    'is_superuser': user.is_superuser,
-                }
-                
-                # Add user's organizations and roles
-                memberships = Membership.objects.filter(user=user).select_related('organization')
-                response.data['organizations'] = [
-                    {
-                        'id': m.organization.id,
-                        'name': m.organization.name,
-                        'role': m.role,
-                    } for m in memberships
-                ]
-                
-            except User.DoesNotExist:
-                pass
+            user = self.token_serializer.user
+            response.data['user'] = {
+                'id': user.id,
+                'email': user.email,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'is_superuser': user.is_superuser,
+            }
+            
+            # Add user's organizations and roles
+            memberships = Membership.objects.filter(user=user).values_list('organization_id', 'organization__name', 'role')
+            response.data['organizations'] = [
+                {
+                    'id': org_id,
+                    'name': org_name,
+                    'role': role,
+                } for org_id, org_name, role in memberships
+            ]
         
         return response
 
+    def get_serializer(self, *args, **kwargs):
+        # Keep the token serializer so post() can reuse the user it authenticated
+        self.token_serializer = super().get_serializer(*args, **kwargs)
+        return self.token_serializer
+
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
@@ -86,14 +95,16 @@ def current_user(request):
     user = request.user
     
     # Get user's organizations and roles
-    memberships = Membership.objects.filter(user=user).select_related('organization')
+    memberships = Membership.objects.filter(user=user).values_list(
+        'organization_id', 'organization__name', 'organization__slug', 'role'
+    )
     organizations = [
         {
-            'id': m.organization.id,
-            'name': m.organization.name,
-            'slug': m.organization.slug,
-            'role': m.role,
-        } for m in memberships
+            'id': org_id,
+            'name': org_name,
+            'slug': org_slug,
+            'role': role,
+        } for org_id, org_name, org_slug, role in memberships
     ]
     
     return Response({
@@ -120,8 +131,9 @@ def change_password(request):
     user.set_password(new_password)
     user.save()
     
-    # Create audit event
-    AuditEvent.objects.create(
+    # Create audit event; written on commit rather than buffered, so it
+    # can't be lost with the worker
+    record_audit_event(
         user=user,
         event='password_change',
         metadata={'method': 'api'}
@@ -140,9 +152,8 @@ def social_auth(request):
         # For development/demo purposes, create a demo user
         demo_email = f"demo.user@{provider}.com"
         
-        try:
-            user = User.objects.get(email=demo_email)
-        except User.DoesNotExist:
+        user = User.objects.filter(email=demo_email).first()
+        if user is None:
             user = User.objects.create_user(
                 email=demo_email,
                 first_name=f"Demo",
@@ -151,7 +162,7 @@ def social_auth(request):
             )
             
             # Create audit event
-            AuditEvent.objects.create(
+            record_audit_event(
                 user=user,
                 event='social_account_added',
                 metadata={'provider': provider, 'method': 'demo'}
@@ -183,85 +194,62 @@ class UserListCreateView(generics.ListCreateAPIView):
     """List and create users"""
     queryset = User.objects.all()
     permission_classes = [permissions.IsAuthenticated]
-    
-    def get_serializer_class(self):
-        from .serializers import UserListSerializer
-        return UserListSerializer
+    serializer_class = UserListSerializer
 
 
 class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a user"""
     queryset = User.objects.all()
     permission_classes = [permissions.IsAuthenticated]
-    
-    def get_serializer_class(self):
-        from .serializers import UserDetailSerializer
-        return UserDetailSerializer
+    serializer_class = UserDetailSerializer
 
 
 class OrganizationListCreateView(generics.ListCreateAPIView):
     """List and create organizations"""
     queryset = Organization.objects.all()
     permission_classes = [permissions.IsAuthenticated]
-    
-    def get_serializer_class(self):
-        from .serializers import OrganizationListSerializer
-        return OrganizationListSerializer
+    serializer_class = OrganizationListSerializer
 
 
 class OrganizationDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete an organization"""
     queryset = Organization.objects.all()
     permission_classes = [permissions.IsAuthenticated]
-    
-    def get_serializer_class(self):
-        from .serializers import OrganizationDetailSerializer
-        return OrganizationDetailSerializer
+    serializer_class = OrganizationDetailSerializer
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def user_permissions(request, user_id):
     """Get user permissions"""
-    try:
-        user = User.objects.get(id=user_id)
-        permissions_list = user.get_all_permissions()
-        return Response({
-            'user_id': user_id,
-            'permissions': list(permissions_list)
-        })
-    except User.DoesNotExist:
+    permissions_list = get_cached_user_permissions(user_id)
+    if permissions_list is None:
         return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response({
+        'user_id': user_id,
+        'permissions': permissions_list
+    })
 
 
 class GroupListCreateView(generics.ListCreateAPIView):
     """List and create groups (roles)"""
     queryset = Group.objects.all()
     permission_classes = [permissions.IsAuthenticated]
-    
-    def get_serializer_class(self):
-        from .serializers import GroupListSerializer
-        return GroupListSerializer
+    serializer_class = GroupListSerializer
 
 
 class GroupDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a group"""
     queryset = Group.objects.all()
     permission_classes = [permissions.IsAuthenticated]
-    
-    def get_serializer_class(self):
-        from .serializers import GroupDetailSerializer
-        return GroupDetailSerializer
+    serializer_class = GroupDetailSerializer
 
 
 class PermissionListView(generics.ListAPIView):
     """List all permissions"""
     queryset = Permission.objects.all()
     permission_classes = [permissions.IsAuthenticated]
-    
-    def get_serializer_class(self):
-        from .serializers import PermissionSerializer
-        return PermissionSerializer
+    serializer_class = PermissionSerializer
 
 
 class RolePermissionMatrixListCreateView(generics.ListCreateAPIView):
@@ -279,34 +267,100 @@ class RolePermissionMatrixListCreateView(generics.ListCreateAPIView):
         })
 
 
+class AuditLogPagination(LimitOffsetPagination):
+    """Limit/offset pagination with a hard cap on page size"""
+    default_limit = 50
+    max_limit = 500
+
+
 class AuditLogListView(generics.ListAPIView):
-    """List audit events"""
-    queryset = AuditEvent.objects.all()
+    """List audit events, filterable by user_id, event and since (ISO datetime)"""
+    queryset = AuditEvent.objects.select_related('user', 'organization').order_by('-created_at')
     permission_classes = [permissions.IsAuthenticated]
+    serializer_class = AuditEventSerializer
+    pagination_class = AuditLogPagination
     
-    def get_serializer_class(self):
-        from .serializers import AuditEventSerializer
-        return AuditEventSerializer
+    # Window applied when the client does not narrow the listing itself
+    default_window = timedelta(days=7)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user_id = self.request.query_params.get('user_id')
+        event = self.request.query_params.get('event')
+        since = parse_datetime(self.request.query_params.get('since', ''))
+        
+        if user_id:
+            queryset = queryset.filter(user_id=user_id)
+        if event:
+            queryset = queryset.filter(event=event)
+        if since:
+            queryset = queryset.filter(created_at__gte=since)
+        elif not (user_id or event):
+            queryset = queryset.filter(created_at__gte=timezone.now() - self.default_window)
+            
+        return queryset
 
 
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from django.db import connection, transaction
 from django.db.models import Q, Count
 from broker_console.models import Employer, Employee, Plan, Carrier, EmployeeFormSubmission
+from broker_console import reference
+from .permissions import is_broker_admin, require_roles
+from functools import reduce
+import operator
+
+# Lookups used by the dashboard search boxes. Backed by trigram indexes on
+# PostgreSQL (see broker_console migrations 0006 and 0008).
+EMPLOYEE_SEARCH_LOOKUPS = ('first_name__icontains', 'last_name__icontains', 'email__icontains', 'employee_id__icontains')
+SUBMISSION_SEARCH_LOOKUPS = ('first_name__icontains', 'last_name__icontains', 'email__icontains')
+
+
+def search_filter(lookups, search_query):
+    """Build an OR'ed Q filter applying search_query to each lookup"""
+    return reduce(operator.or_, (Q(**{lookup: search_query}) for lookup in lookups))
+
+
+class FixedCountPaginator(Paginator):
+    """Paginator that reuses a row count the view has already computed"""
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count = count
+
+    @cached_property
+    def count(self):
+        return self._count
+
+
+def count_querysets(**querysets):
+    """
+    Count several querysets in a single database roundtrip.
+    Returns a dict mapping each keyword to its row count.
+    """
+    selects, params = [], []
+    for queryset in querysets.values():
+        sql, query_params = queryset.order_by().values('pk').query.sql_with_params()
+        selects.append(f'(SELECT COUNT(*) FROM ({sql}) AS subquery)')
+        params.extend(query_params)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT ' + ', '.join(selects), params)
+        return dict(zip(querysets, cursor.fetchone()))
 
 @login_required
 def dashboard_view(request):
     """Dashboard view for authenticated users"""
     # Get dashboard statistics
-    stats = {
-        'users_count': User.objects.count(),
-        'organizations_count': Organization.objects.count(),
-        'memberships_count': Membership.objects.count(),
-        'audit_events_count': AuditEvent.objects.count(),
-        'recent_events': []
-    }
+    stats = count_querysets(
+        users_count=User.objects.all(),
+        organizations_count=Organization.objects.all(),
+        memberships_count=Membership.objects.all(),
+        audit_events_count=AuditEvent.objects.all(),
+    )
     
     # Get recent audit events
     recent_events = AuditEvent.objects.select_related('user', 'organization').order_by('-created_at')[:5]
@@ -320,13 +374,12 @@ def dashboard_view(request):
 @permission_classes([permissions.IsAuthenticated])
 def dashboard_stats(request):
     """Get dashboard statistics"""
-    stats = {
-        'users_count': User.objects.count(),
-        'organizations_count': Organization.objects.count(),
-        'memberships_count': Membership.objects.count(),
-        'audit_events_count': AuditEvent.objects.count(),
-        'recent_events': []
-    }
+    stats = count_querysets(
+        users_count=User.objects.all(),
+        organizations_count=Organization.objects.all(),
+        memberships_count=Membership.objects.all(),
+        audit_events_count=AuditEvent.objects.all(),
+    )
     
     # Get recent audit events
     recent_events = AuditEvent.objects.select_related('user', 'organization').order_by('-created_at')[:10]
@@ -344,12 +397,9 @@ def dashboard_stats(request):
 # Dashboard Navigation Views
 
 @login_required
+@require_roles('Broker Admin')
 def employers_view(request):
     """Employers list view for Broker Admin"""
-    if not (request.user.is_superuser or request.user.groups.filter(name='Broker Admin').exists()):
-        messages.error(request, 'You do not have permission to access this page.')
-        return redirect('dashboard')
-    
     from broker_console.models import Employer, Employee
     
     # Get employers (with search/filter functionality)
@@ -392,19 +442,14 @@ def employers_view(request):
     })
 
 @login_required
+@require_roles('Broker Admin', 'Employer Admin')
 def employees_view(request):
     """Employees list view"""
-    # Check permissions
-    if not (request.user.is_superuser or 
-            request.user.groups.filter(name__in=['Broker Admin', 'Employer Admin']).exists()):
-        messages.error(request, 'You do not have permission to access this page.')
-        return redirect('dashboard')
-    
     from broker_console.models import Employee, Employer
     from datetime import date, timedelta
     
     # Get employees based on user role
-    if request.user.is_superuser or request.user.groups.filter(name='Broker Admin').exists():
+    if is_broker_admin(request.user):
         # Broker can see all employees
         employees = Employee.objects.select_related('employer').order_by('-created_at')
     else:
@@ -417,12 +462,7 @@ def employees_view(request):
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        employees = employees.filter(
-            Q(first_name__icontains=search_query) | 
-            Q(last_name__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(employee_id__icontains=search_query)
-        )
+        employees = employees.filter(search_filter(EMPLOYEE_SEARCH_LOOKUPS, search_query))
     
     # Status filter
     status_filter = request.GET.get('status', '')
@@ -445,7 +485,7 @@ def employees_view(request):
     # Stats
     recent_date = date.today() - timedelta(days=90)
     stats = {
-        'total_employees': employees.count(),
+        'total_employees': paginator.count,
         'active_employees': employees.filter(employment_status='active').count(),
         'pending_enrollments': 5,  # Mock data
         'recent_hires': employees.filter(hire_date__gte=recent_date).count()
@@ -463,11 +503,11 @@ def employees_view(request):
 @login_required 
 def benefits_view(request):
     """Benefits/Plans view"""
-    from broker_console.models import Plan, Carrier
+    from broker_console.models import Plan
     
     # Get available plans
     plans = Plan.objects.select_related('carrier').filter(is_active=True).order_by('plan_type', 'name')
-    carriers = Carrier.objects.filter(is_active=True).order_by('name')
+    carriers = reference.active_carriers()
     
     # Filter by plan type
     plan_type_filter = request.GET.get('plan_type', '')
@@ -485,11 +525,12 @@ def benefits_view(request):
     plans_page = paginator.get_page(page_number)
     
     # Stats
+    plan_counts = reference.active_plan_counts()
     stats = {
-        'total_plans': Plan.objects.filter(is_active=True).count(),
-        'medical_plans': Plan.objects.filter(plan_type='medical', is_active=True).count(),
-        'dental_plans': Plan.objects.filter(plan_type='dental', is_active=True).count(),
-        'vision_plans': Plan.objects.filter(plan_type='vision', is_active=True).count(),
+        'total_plans': plan_counts['total'],
+        'medical_plans': plan_counts['medical'],
+        'dental_plans': plan_counts['dental'],
+        'vision_plans': plan_counts['vision'],
     }
     
     return render(request, 'dashboard/benefits.html', {
@@ -501,13 +542,9 @@ def benefits_view(request):
     })
 
 @login_required
+@require_roles('Broker Admin', 'Employer Admin')
 def reports_view(request):
     """Reports view"""
-    if not (request.user.is_superuser or 
-            request.user.groups.filter(name__in=['Broker Admin', 'Employer Admin']).exists()):
-        messages.error(request, 'You do not have permission to access this page.')
-        return redirect('dashboard')
-    
     # Mock report data for now
     reports = [
         {
@@ -535,13 +572,9 @@ def reports_view(request):
     })
 
 @login_required
+@require_roles('Broker Admin', 'Employer Admin')
 def exports_view(request):
     """Exports view"""
-    if not (request.user.is_superuser or 
-            request.user.groups.filter(name__in=['Broker Admin', 'Employer Admin']).exists()):
-        messages.error(request, 'You do not have permission to access this page.')
-        return redirect('dashboard')
-    
     # Get recent export jobs (from the model)
     from broker_console.models import ExportJob
     exports = ExportJob.objects.select_related('employer', 'carrier').order_by('-created_at')[:20]
@@ -551,12 +584,9 @@ def exports_view(request):
     })
 
 @login_required
+@require_roles('Broker Admin')
 def onboarding_wizard_view(request):
     """Company onboarding wizard for brokers"""
-    if not (request.user.is_superuser or request.user.groups.filter(name='Broker Admin').exists()):
-        messages.error(request, 'You do not have permission to access this page.')
-        return redirect('dashboard')
-    
     return render(request, 'dashboard/onboarding_wizard.html')
 
 @api_view(['POST'])
@@ -701,7 +731,7 @@ def bulk_import_employees(request):
         
         # Create audit event
         if request.user.is_authenticated:
-            AuditEvent.objects.create(
+            record_audit_event(
                 user=request.user,
                 event='bulk_employee_import',
                 metadata={
@@ -755,11 +785,133 @@ def download_employee_template(request):
     
     return response
 
+# Carriers referenced by PLAN_TEMPLATES, keyed by carrier code
+TEMPLATE_CARRIERS = {'AETNA': 'Aetna', 'ANTHEM': 'Anthem'}
+
+# Standard plan templates offered by the onboarding wizard, keyed by selection.
+# Each becomes one shared Plan per (carrier, external_code), with a
+# PlanPremium for each tier in 'premiums' (monthly, in dollars).
+PLAN_TEMPLATES = {
+    'medical_hmo': {
+        'name': 'HMO Select',
+        'plan_type': 'medical',
+        'carrier_code': 'AETNA',
+        'external_code': 'TPL-MED-HMO',
+        'premiums': {'employee_only': 150.00, 'family': 450.00},
+    },
+    'medical_ppo': {
+        'name': 'PPO Plus',
+        'plan_type': 'medical',
+        'carrier_code': 'ANTHEM',
+        'external_code': 'TPL-MED-PPO',
+        'premiums': {'employee_only': 200.00, 'family': 600.00},
+    },
+    'medical_hdhp': {
+        'name': 'HDHP + HSA',
+        'plan_type': 'medical',
+        'carrier_code': 'AETNA',
+        'external_code': 'TPL-MED-HDHP',
+        'premiums': {'employee_only': 100.00, 'family': 300.00},
+    },
+    'dental_basic': {
+        'name': 'Basic Dental',
+        'plan_type': 'dental',
+        'carrier_code': 'AETNA',
+        'external_code': 'TPL-DEN-BASIC',
+        'premiums': {'employee_only': 25.00, 'family': 75.00},
+    },
+    'dental_enhanced': {
+        'name': 'Enhanced Dental',
+        'plan_type': 'dental',
+        'carrier_code': 'ANTHEM',
+        'external_code': 'TPL-DEN-ENH',
+        'premiums': {'employee_only': 40.00, 'family': 120.00},
+    },
+    'vision_standard': {
+        'name': 'Standard Vision',
+        'plan_type': 'vision',
+        'carrier_code': 'AETNA',
+        'external_code': 'TPL-VIS-STD',
+        'premiums': {'employee_only': 8.00, 'family': 20.00},
+    },
+    'life_basic': {
+        'name': 'Basic Life Insurance',
+        'plan_type': 'life',
+        'carrier_code': 'AETNA',
+        'external_code': 'TPL-LIFE-BASIC',
+        'premiums': {'employee_only': 0.00},  # Employer paid
+    },
+    'life_supplemental': {
+        'name': 'Supplemental Life',
+        'plan_type': 'life',
+        'carrier_code': 'AETNA',
+        'external_code': 'TPL-LIFE-SUPP',
+        'premiums': {},  # Age-rated per $1,000 of coverage
+    },
+    'disability_std': {
+        'name': 'Short-Term Disability',
+        'plan_type': 'disability',
+        'carrier_code': 'AETNA',
+        'external_code': 'TPL-DIS-STD',
+        'premiums': {'employee_only': 0.00},  # Employer paid
+    },
+    'disability_ltd': {
+        'name': 'Long-Term Disability',
+        'plan_type': 'disability',
+        'carrier_code': 'AETNA',
+        'external_code': 'TPL-DIS-LTD',
+        'premiums': {'employee_only': 0.00},  # Employer paid
+    },
+}
+
+def _template_carriers(codes):
+    """Resolve template carrier codes to Carriers from the cached list, creating any that are missing"""
+    carriers = {carrier.code: carrier for carrier in reference.carriers() if carrier.code in codes}
+    for code in set(codes) - carriers.keys():
+        carriers[code], _ = Carrier.objects.get_or_create(
+            name=TEMPLATE_CARRIERS[code],
+            defaults={'code': code, 'is_active': True}
+        )
+    return carriers
+
+
+def _missing_template_premiums(reused_plans, effective_date):
+    """
+    Build PlanPremiums for the reused template plans' tiers that have no
+    premium in effect on effective_date. Each ends the day before the tier's
+    next later premium, if any, so premium periods never overlap.
+    """
+    from broker_console.models import PlanPremium
+
+    periods = {}
+    for plan_id, tier, starts, ends in PlanPremium.objects.filter(
+        plan__in=[plan for plan, _ in reused_plans]
+    ).values_list('plan_id', 'coverage_tier', 'effective_date', 'end_date'):
+        periods.setdefault((plan_id, tier), []).append((starts, ends))
+
+    premiums = []
+    for plan, template in reused_plans:
+        for tier, premium in template['premiums'].items():
+            tier_periods = periods.get((plan.pk, tier), [])
+            if any(starts <= effective_date and (ends is None or ends >= effective_date)
+                   for starts, ends in tier_periods):
+                continue
+            next_start = min((starts for starts, _ in tier_periods if starts > effective_date), default=None)
+            premiums.append(PlanPremium(
+                plan=plan,
+                coverage_tier=tier,
+                monthly_premium=premium,
+                effective_date=effective_date,
+                end_date=next_start - timedelta(days=1) if next_start else None
+            ))
+    return premiums
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def create_plan_templates(request):
     """Create standard plan templates for a new employer"""
-    if not (request.user.is_superuser or request.user.groups.filter(name='Broker Admin').exists()):
+    if not is_broker_admin(request.user):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
     employer_id = request.data.get('employer_id')
@@ -769,191 +921,97 @@ def create_plan_templates(request):
         return Response({'error': 'Employer ID is required'}, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        from broker_console.models import Employer, Plan, Carrier
-        employer = Employer.objects.get(id=employer_id)
-        
-        # Get or create default carriers
-        aetna, _ = Carrier.objects.get_or_create(
-            name='Aetna',
-            defaults={'code': 'AETNA', 'is_active': True}
-        )
-        anthem, _ = Carrier.objects.get_or_create(
-            name='Anthem',
-            defaults={'code': 'ANTHEM', 'is_active': True}
-        )
+        from broker_console.models import Employer, Plan, PlanPremium, Carrier
+        employer = Employer.objects.only('id', 'effective_date').filter(pk=employer_id).first()
+        if employer is None:
+            return Response({'error': 'Employer not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        created_plans = []
+        from broker_console.models import EmployerOffering
+        templates = [PLAN_TEMPLATES[plan_key] for plan_key in dict.fromkeys(selected_plans) if plan_key in PLAN_TEMPLATES]
         
-        # Plan templates based on selections
-        plan_templates = {
-            'medical_hmo': {
-                'name': 'HMO Select',
-                'plan_type': 'medical',
-                'carrier': aetna,
-                'network_type': 'HMO',
-                'description': 'Comprehensive HMO plan with local network focus',
-                'employee_premium': 150.00,
-                'family_premium': 450.00,
-                'individual_deductible': 1500.00,
-                'family_deductible': 3000.00,
-                'individual_oop_max': 6000.00,
-                'family_oop_max': 12000.00,
-                'copay_primary': 25.00,
-                'copay_specialist': 50.00,
-                'copay_er': 150.00,
-                'is_active': True
-            },
-            'medical_ppo': {
-                'name': 'PPO Plus',
-                'plan_type': 'medical',
-                'carrier': anthem,
-                'network_type': 'PPO',
-                'description': 'Flexible PPO plan with nationwide network',
-                'employee_premium': 200.00,
-                'family_premium': 600.00,
-                'individual_deductible': 1000.00,
-                'family_deductible': 2000.00,
-                'individual_oop_max': 5000.00,
-                'family_oop_max': 10000.00,
-                'copay_primary': 20.00,
-                'copay_specialist': 40.00,
-                'copay_er': 100.00,
-                'is_active': True
-            },
-            'medical_hdhp': {
-                'name': 'HDHP + HSA',
-                'plan_type': 'medical',
-                'carrier': aetna,
-                'network_type': 'HDHP',
-                'description': 'High deductible health plan with HSA eligibility',
-                'employee_premium': 100.00,
-                'family_premium': 300.00,
-                'individual_deductible': 2500.00,
-                'family_deductible': 5000.00,
-                'individual_oop_max': 7000.00,
-                'family_oop_max': 14000.00,
-                'hsa_employer_contribution': 1000.00,
-                'is_active': True
-            },
-            'dental_basic': {
-                'name': 'Basic Dental',
-                'plan_type': 'dental',
-                'carrier': aetna,
-                'description': 'Preventive and basic dental coverage',
-                'employee_premium': 25.00,
-                'family_premium': 75.00,
-                'annual_max': 1000.00,
-                'preventive_coverage': 100,  # 100%
-                'basic_coverage': 80,        # 80%
-                'major_coverage': 50,        # 50%
-                'is_active': True
-            },
-            'dental_enhanced': {
-                'name': 'Enhanced Dental',
-                'plan_type': 'dental',
-                'carrier': anthem,
-                'description': 'Comprehensive dental with orthodontia',
-                'employee_premium': 40.00,
-                'family_premium': 120.00,
-                'annual_max': 2000.00,
-                'preventive_coverage': 100,  # 100%
-                'basic_coverage': 80,        # 80%
-                'major_coverage': 60,        # 60%
-                'orthodontia_coverage': 50,  # 50%
-                'orthodontia_max': 2000.00,
-                'is_active': True
-            },
-            'vision_standard': {
-                'name': 'Standard Vision',
-                'plan_type': 'vision',
-                'carrier': aetna,
-                'description': 'Annual eye exams and eyewear allowance',
-                'employee_premium': 8.00,
-                'family_premium': 20.00,
-                'copay_exam': 10.00,
-                'frame_allowance': 150.00,
-                'lens_allowance': 150.00,
-                'contact_allowance': 150.00,
-                'is_active': True
-            },
-            'life_basic': {
-                'name': 'Basic Life Insurance',
-                'plan_type': 'life',
-                'carrier': aetna,
-                'description': 'Employer-paid basic life insurance',
-                'coverage_amount': '1x Annual Salary',
-                'max_coverage': 50000.00,
-                'employee_premium': 0.00,  # Employer paid
-                'is_active': True
-            },
-            'life_supplemental': {
-                'name': 'Supplemental Life',
-                'plan_type': 'life',
-                'carrier': aetna,
-                'description': 'Optional additional life insurance',
-                'coverage_options': '1x, 2x, 3x, 4x, 5x Annual Salary',
-                'max_coverage': 500000.00,
-                'rate_per_1000': 0.50,
-                'is_active': True
-            },
-            'disability_std': {
-                'name': 'Short-Term Disability',
-                'plan_type': 'disability',
-                'carrier': aetna,
-                'description': 'Short-term disability income protection',
-                'benefit_percentage': 60,
-                'max_weekly_benefit': 1500.00,
-                'elimination_period': 7,  # days
-                'max_benefit_period': 26,  # weeks
-                'employee_premium': 0.00,  # Employer paid
-                'is_active': True
-            },
-            'disability_ltd': {
-                'name': 'Long-Term Disability',
-                'plan_type': 'disability',
-                'carrier': aetna,
-                'description': 'Long-term disability income protection',
-                'benefit_percentage': 60,
-                'max_monthly_benefit': 5000.00,
-                'elimination_period': 90,  # days
-                'benefit_to_age': 65,
-                'employee_premium': 0.00,  # Employer paid
-                'is_active': True
+        # Carriers, plans, offerings and the audit event commit together
+        with transaction.atomic():
+            # Resolve the carriers used by the selected templates
+            carriers = _template_carriers({template['carrier_code'] for template in templates})
+            
+            # Template plans are shared between employers: reuse the ones
+            # already created and insert the rest with their premiums. Reused
+            # plans get premiums for any tier not yet priced at this
+            # employer's effective date.
+            existing_plans = {
+                (plan.carrier_id, plan.external_code): plan
+                for plan in Plan.objects.filter(
+                    carrier__in=carriers.values(),
+                    external_code__in=[template['external_code'] for template in templates]
+                )
             }
-        }
-        
-        # Create selected plans
-        for plan_key in selected_plans:
-            if plan_key in plan_templates:
-                template = plan_templates[plan_key]
-                plan = Plan.objects.create(**template)
-                
-                # Create employer offering for this plan
-                from broker_console.models import EmployerOffering
-                EmployerOffering.objects.create(
+            plans = []
+            new_plans = []
+            reused_plans = []
+            premiums = []
+            for template in templates:
+                carrier = carriers[template['carrier_code']]
+                plan = existing_plans.get((carrier.pk, template['external_code']))
+                if plan is None:
+                    plan = Plan(
+                        carrier=carrier,
+                        name=template['name'],
+                        plan_type=template['plan_type'],
+                        external_code=template['external_code'],
+                        is_active=True
+                    )
+                    new_plans.append(plan)
+                    premiums.extend(
+                        PlanPremium(
+                            plan=plan,
+                            coverage_tier=tier,
+                            monthly_premium=premium,
+                            effective_date=employer.effective_date
+                        )
+                        for tier, premium in template['premiums'].items()
+                    )
+                else:
+                    reused_plans.append((plan, template))
+                plans.append(plan)
+            if reused_plans:
+                premiums.extend(_missing_template_premiums(reused_plans, employer.effective_date))
+            Plan.objects.bulk_create(new_plans)
+            PlanPremium.objects.bulk_create(premiums)
+            
+            # Offer each plan the employer isn't offered yet
+            offered_plan_ids = set(
+                EmployerOffering.objects.filter(employer=employer, plan__in=plans).values_list('plan_id', flat=True)
+            )
+            EmployerOffering.objects.bulk_create([
+                EmployerOffering(
                     employer=employer,
                     plan=plan,
                     is_active=True,
-                    employer_contribution_percent=75.0  # Default 75% contribution
-                )
-                
-                created_plans.append({
+                    contribution_mode='percent',
+                    contribution_value=75  # Default 75% contribution
+                ) for plan in plans if plan.pk not in offered_plan_ids
+            ])
+            
+            created_plans = [
+                {
                     'id': plan.id,
                     'name': plan.name,
                     'type': plan.plan_type,
                     'carrier': plan.carrier.name
-                })
-        
-        # Create audit event
-        AuditEvent.objects.create(
-            user=request.user,
-            event='plan_templates_created',
-            metadata={
-                'employer_id': employer_id,
-                'plans_created': len(created_plans),
-                'selected_plans': selected_plans
-            }
-        )
+                } for plan in plans
+            ]
+            transaction.on_commit(reference.invalidate_reference_data)
+            
+            # Create audit event
+            AuditEvent.objects.create(
+                user=request.user,
+                event='plan_templates_created',
+                metadata={
+                    'employer_id': employer_id,
+                    'plans_created': len(created_plans),
+                    'selected_plans': selected_plans
+                }
+            )
         
         return Response({
             'success': True,
@@ -961,43 +1019,34 @@ def create_plan_templates(request):
             'created_plans': created_plans
         })
         
-    except Employer.DoesNotExist:
-        return Response({'error': 'Employer not found'}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
         return Response({'error': f'Plan creation failed: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @login_required
+@require_roles('Broker Admin')
 def carrier_setup_view(request):
     """Carrier integration setup for brokers"""
-    if not (request.user.is_superuser or request.user.groups.filter(name='Broker Admin').exists()):
-        messages.error(request, 'You do not have permission to access this page.')
-        return redirect('dashboard')
-    
     # Get carrier statistics
-    from broker_console.models import Carrier
+    active_carrier_count = len(reference.active_carriers())
     stats = {
-        'total_carriers': Carrier.objects.count(),
-        'active_carriers': Carrier.objects.filter(is_active=True).count(),
-        'integrated_carriers': Carrier.objects.filter(is_active=True).count(),  # Simplified for demo
+        'total_carriers': len(reference.carriers()),
+        'active_carriers': active_carrier_count,
+        'integrated_carriers': active_carrier_count,  # Simplified for demo
         'pending_connections': 1  # Mock data
     }
     
     return render(request, 'dashboard/carrier_setup.html', {'stats': stats})
 
 @login_required
+@require_roles('Broker Admin')
 def system_config_view(request):
     """System configuration for superusers and broker admins"""
-    if not (request.user.is_superuser or request.user.groups.filter(name='Broker Admin').exists()):
-        messages.error(request, 'You do not have permission to access this page.')
-        return redirect('dashboard')
-    
     return render(request, 'dashboard/system_config.html')
 
 def employee_form_view(request, employer_id):
     """Employee form submission page"""
-    try:
-        employer = Employer.objects.get(id=employer_id)
-    except Employer.DoesNotExist:
+    employer = Employer.objects.only('id', 'name').filter(pk=employer_id).first()
+    if employer is None:
         messages.error(request, 'Employer not found.')
         return redirect('dashboard')
     
@@ -1005,30 +1054,25 @@ def employee_form_view(request, employer_id):
         'employer': employer
     })
 
-@login_required  
+@login_required
+@require_roles('Broker Admin', 'Employer Admin')
 def employer_forms_view(request, employer_id):
     """Employer dashboard for reviewing form submissions"""
-    if not (request.user.is_superuser or request.user.groups.filter(name__in=['Broker Admin', 'Employer Admin']).exists()):
-        messages.error(request, 'You do not have permission to access this page.')
-        return redirect('dashboard')
-    
-    try:
-        employer = Employer.objects.get(id=employer_id)
-    except Employer.DoesNotExist:
+    employer = Employer.objects.only('id', 'name').filter(pk=employer_id).first()
+    if employer is None:
         messages.error(request, 'Employer not found.')
         return redirect('employers')
     
-    # Get form submissions for this employer
-    submissions = EmployeeFormSubmission.objects.filter(employer=employer).order_by('-created_at')
+    # Get form submissions for this employer, limited to the columns the list renders
+    submissions = EmployeeFormSubmission.objects.filter(employer=employer).only(
+        'id', 'first_name', 'last_name', 'date_of_birth', 'email', 'phone', 'job_title',
+        'department', 'status', 'created_at'
+    ).order_by('-created_at')
     
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        submissions = submissions.filter(
-            Q(first_name__icontains=search_query) | 
-            Q(last_name__icontains=search_query) |
-            Q(email__icontains=search_query)
-        )
+        submissions = submissions.filter(search_filter(SUBMISSION_SEARCH_LOOKUPS, search_query))
     
     # Status filter
     status_filter = request.GET.get('status', '')
@@ -1049,19 +1093,19 @@ def employer_forms_view(request, employer_id):
             month_ago = today - timedelta(days=30)
             submissions = submissions.filter(created_at__date__gte=month_ago)
     
-    # Pagination
-    paginator = Paginator(submissions, 20)
+    # Stats
+    stats = submissions.aggregate(
+        total_submissions=Count('id'),
+        pending_submissions=Count('id', filter=Q(status='pending')),
+        approved_submissions=Count('id', filter=Q(status='approved')),
+        rejected_submissions=Count('id', filter=Q(status='rejected')),
+    )
+    
+    # Pagination (the aggregate above already counted the filtered queryset)
+    paginator = FixedCountPaginator(submissions, 20, stats['total_submissions'])
     page_number = request.GET.get('page')
     submissions_page = paginator.get_page(page_number)
     
-    # Stats
-    stats = {
-        'total_submissions': submissions.count(),
-        'pending_submissions': submissions.filter(status='pending').count(),
-        'approved_submissions': submissions.filter(status='approved').count(),
-        'rejected_submissions': submissions.filter(status='rejected').count(),
-    }
-    
     return render(request, 'employer_forms.html', {
         'employer': employer,
         'submissions': submissions_page,
@@ -1071,21 +1115,25 @@ def employer_forms_view(request, employer_id):
     })
 
 @login_required
+@require_roles('Broker Admin')
 def broker_dashboard_view(request):
     """Broker dashboard showing all form submissions across employers"""
-    if not (request.user.is_superuser or request.user.groups.filter(name='Broker Admin').exists()):
-        messages.error(request, 'You do not have permission to access this page.')
-        return redirect('dashboard')
-    
     # Get all form submissions
-    submissions = EmployeeFormSubmission.objects.select_related('employer').order_by('-created_at')[:50]
+    submissions = EmployeeFormSubmission.objects.select_related('employer').only(
+        'id', 'first_name', 'last_name', 'date_of_birth', 'email', 'job_title', 'department',
+        'status', 'created_at', 'employer__id', 'employer__name', 'employer__ein'
+    ).order_by('-created_at')[:50]
     
     # Stats
-    all_submissions = EmployeeFormSubmission.objects.all()
+    sub_stats = EmployeeFormSubmission.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        approved=Count('id', filter=Q(status='approved')),
+    )
     stats = {
-        'total_submissions': all_submissions.count(),
-        'pending_submissions': all_submissions.filter(status='pending').count(),
-        'approved_submissions': all_submissions.filter(status='approved').count(),
+        'total_submissions': sub_stats['total'],
+        'pending_submissions': sub_stats['pending'],
+        'approved_submissions': sub_stats['approved'],
         'total_employers': Employer.objects.count(),
     }
     
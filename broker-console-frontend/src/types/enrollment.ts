@@ -49,7 +49,7 @@ export interface PlanEnrollment {
   effective_date: string;
   termination_date?: string;
   covered_dependents: string[];
-  covered_dependents_details: Dependent[];
+  covered_dependents_details?: Dependent[];
   created_at: string;
   updated_at: string;
 }
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class BrokerConsoleConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'broker_console'
+    
+    def ready(self):
+        """
+        Import signal handlers when the app is ready.
+        This ensures that all signals are connected properly.
+        """
+        import broker_console.signals
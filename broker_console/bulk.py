@@ -0,0 +1,55 @@
+"""
+Bulk loading for broker_console models. On PostgreSQL rows can be streamed
+with COPY FROM STDIN, which skips the per-row INSERT parsing and planning.
+"""
+import io
+from django.db import connection
+
+
+def bulk_insert(model, objs, batch_size, fast=False):
+    """
+    Insert unsaved model instances. With fast=True on PostgreSQL the rows are
+    streamed with COPY FROM STDIN; otherwise bulk_create is used. Neither path
+    calls save() or sends signals.
+    """
+    if fast and connection.vendor == 'postgresql':
+        copy_insert(model, objs)
+    else:
+        model.objects.bulk_create(objs, batch_size=batch_size)
+
+
+def copy_insert(model, objs):
+    """
+    Insert model instances with a single PostgreSQL COPY. Primary keys must
+    already be set, as they are for the UUID-keyed broker_console models.
+    """
+    if not objs:
+        return
+    fields = model._meta.concrete_fields
+    buffer = io.StringIO()
+    for obj in objs:
+        buffer.write('\t'.join(
+            _copy_text(field.get_db_prep_save(field.pre_save(obj, True), connection))
+            for field in fields
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+    quote_name = connection.ops.quote_name
+    columns = ', '.join(quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f'COPY {quote_name(model._meta.db_table)} ({columns}) FROM STDIN', buffer)
+
+
+def _copy_text(value):
+    """Encode a value for COPY's text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
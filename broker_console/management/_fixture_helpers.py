@@ -0,0 +1,128 @@
+"""
+Loaders shared by the broker_console fixture commands.
+Each loader reads the rows that already exist in one query and bulk-creates
+the missing ones, so re-running a command only inserts what is new.
+"""
+from broker_console.bulk import bulk_insert
+from broker_console.models import Carrier, Employee, Employer, EmployerOffering, Plan, PlanPremium
+from broker_console.reference import invalidate_reference_data
+
+
+def load_carrier():
+    """Get or create the Aetna carrier used by the fixtures. Returns (carrier, created)."""
+    return Carrier.objects.get_or_create(
+        name='Aetna',
+        defaults={'code': 'AETNA', 'is_active': True}
+    )
+
+
+def load_plans(carrier, plan_configs, effective_date, batch_size):
+    """
+    Create the carrier's plans that don't exist yet, matched on external_code,
+    with a PlanPremium for each tier in the config's 'premiums' dict.
+    Returns (plans in config order, newly created plans).
+    """
+    existing_plans = {
+        plan.external_code: plan
+        for plan in Plan.objects.filter(
+            carrier=carrier,
+            external_code__in=[config['external_code'] for config in plan_configs]
+        )
+    }
+    plans = []
+    new_plans = []
+    premiums = []
+    for config in plan_configs:
+        plan = existing_plans.get(config['external_code'])
+        if plan is None:
+            plan = Plan(
+                carrier_id=carrier.pk,
+                external_code=config['external_code'],
+                name=config['name'],
+                plan_type=config['plan_type'],
+                is_active=True
+            )
+            new_plans.append(plan)
+            premiums.extend(
+                PlanPremium(
+                    plan_id=plan.pk,
+                    coverage_tier=tier,
+                    monthly_premium=premium,
+                    effective_date=effective_date
+                )
+                for tier, premium in config['premiums'].items()
+            )
+        plans.append(plan)
+
+    Plan.objects.bulk_create(new_plans, batch_size=batch_size)
+    PlanPremium.objects.bulk_create(premiums, batch_size=batch_size)
+    if new_plans:
+        invalidate_reference_data()
+    return plans, new_plans
+
+
+def load_employers(employers_data, batch_size, **common_fields):
+    """
+    Create the employers that don't exist yet, matched on ein. Each dict in
+    employers_data holds Employer field values; common_fields apply to all.
+    Returns (employers in input order, newly created employers).
+    """
+    existing_employers = Employer.objects.in_bulk(
+        [emp_data['ein'] for emp_data in employers_data], field_name='ein'
+    )
+    employers = []
+    new_employers = []
+    for emp_data in employers_data:
+        employer = existing_employers.get(emp_data['ein'])
+        if employer is None:
+            employer = Employer(**common_fields, **emp_data)
+            new_employers.append(employer)
+        employers.append(employer)
+
+    Employer.objects.bulk_create(new_employers, batch_size=batch_size)
+    return employers, new_employers
+
+
+def load_offerings(offerings, batch_size):
+    """
+    Insert the EmployerOffering instances whose (employer, plan) pair is not
+    offered yet. Returns the newly created offerings.
+    """
+    existing_pairs = set(
+        EmployerOffering.objects.filter(
+            employer_id__in={offering.employer_id for offering in offerings}
+        ).values_list('employer_id', 'plan_id')
+    )
+    new_offerings = [
+        offering for offering in offerings
+        if (offering.employer_id, offering.plan_id) not in existing_pairs
+    ]
+    EmployerOffering.objects.bulk_create(new_offerings, batch_size=batch_size)
+    return new_offerings
+
+
+def load_employees(employees, batch_size, fast=False):
+    """
+    Insert the Employee instances whose (employer, employee_id) pair doesn't
+    exist yet, using bulk_insert. Returns (employees with existing rows
+    substituted, newly created employees).
+    """
+    existing_employees = {
+        (employee.employer_id, employee.employee_id): employee
+        for employee in Employee.objects.filter(
+            employer_id__in={employee.employer_id for employee in employees},
+            employee_id__in=[employee.employee_id for employee in employees]
+        )
+    }
+    loaded = []
+    new_employees = []
+    for employee in employees:
+        existing = existing_employees.get((employee.employer_id, employee.employee_id))
+        if existing is None:
+            new_employees.append(employee)
+            loaded.append(employee)
+        else:
+            loaded.append(existing)
+
+    bulk_insert(Employee, new_employees, batch_size, fast)
+    return loaded, new_employees
@@ -1,23 +1,55 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from datetime import date, timedelta
 from broker_console.models import (
-    Broker, Employer, Carrier, Plan, PlanPremium, EmployerOffering,
+    Broker, Employer, EmployerOffering,
     Employee, EnrollmentPeriod, EmployeeEnrollment
 )
+from broker_console.management._fixture_helpers import (
+    bulk_insert, load_carrier, load_employees, load_offerings, load_plans
+)
 
 
 class Command(BaseCommand):
     help = 'Create test data for enrollment functionality'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Maximum rows per bulk INSERT (default: 500)',
+            default=500
+        )
+        parser.add_argument(
+            '--dump',
+            type=str,
+            metavar='PATH',
+            help='Also write the broker_console data to a JSON fixture for manage.py loaddata',
+        )
+        parser.add_argument(
+            '--fast',
+            action='store_true',
+            help='On PostgreSQL, load employee rows with COPY instead of INSERT',
+        )
+
+    @transaction.atomic
     def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        fast = options['fast']
+        # Per-row progress lines are only written at --verbosity 2 or higher
+        verbose = options['verbosity'] >= 2
         self.stdout.write("Creating enrollment test data...")
 
+        # Every generated date is relative to a single 'today'
+        today = date.today()
+        renewal_date = today + timedelta(days=365)
+        period_end_date = today + timedelta(days=30)
+        coverage_effective_date = today + timedelta(days=45)
+
         # Create or get carrier
-        carrier, created = Carrier.objects.get_or_create(
-            name='Aetna',
-            defaults={'code': 'AETNA', 'is_active': True}
-        )
+        carrier, created = load_carrier()
         if created:
             self.stdout.write(f"Created carrier: {carrier.name}")
 
@@ -41,8 +73,8 @@ class Command(BaseCommand):
             defaults={
                 'broker': broker,
                 'size': 25,
-                'effective_date': date.today(),
-                'renewal_date': date.today() + timedelta(days=365),
+                'effective_date': today,
+                'renewal_date': renewal_date,
                 'status': 'active',
                 'contact_name': 'HR Manager',
                 'contact_email': 'hr@testcompany.com',
@@ -61,67 +93,53 @@ class Command(BaseCommand):
             {'name': 'Aetna Vision', 'plan_type': 'vision', 'external_code': 'AETNA-VIS-001'},
         ]
 
-        plans = []
-        for config in plan_configs:
-            plan, created = Plan.objects.get_or_create(
-                carrier=carrier,
-                external_code=config['external_code'],
-                defaults={
-                    'name': config['name'],
-                    'plan_type': config['plan_type'],
-                    'is_active': True
-                }
-            )
-            plans.append(plan)
-            if created:
+        # Premium rates for each coverage tier, shared by every plan
+        tier_premiums = {
+            'employee_only': 150.00,
+            'employee_spouse': 300.00,
+            'employee_children': 250.00,
+            'family': 450.00,
+        }
+
+        plans, new_plans = load_plans(
+            carrier,
+            [{**config, 'premiums': tier_premiums} for config in plan_configs],
+            today,
+            batch_size
+        )
+        if verbose:
+            for plan in new_plans:
                 self.stdout.write(f"Created plan: {plan.name}")
 
-                # Create premium rates for each coverage tier
-                coverage_tiers = [
-                    ('employee_only', 150.00),
-                    ('employee_spouse', 300.00),
-                    ('employee_children', 250.00),
-                    ('family', 450.00),
-                ]
-
-                for tier, premium in coverage_tiers:
-                    PlanPremium.objects.get_or_create(
-                        plan=plan,
-                        coverage_tier=tier,
-                        defaults={
-                            'monthly_premium': premium,
-                            'effective_date': date.today(),
-                        }
-                    )
-
-        # Create employer offerings
-        for plan in plans:
-            offering, created = EmployerOffering.objects.get_or_create(
-                employer=employer,
-                plan=plan,
-                defaults={
-                    'is_active': True,
-                    'contribution_mode': 'percent',
-                    'contribution_value': 80.0,  # 80% employer contribution
-                }
-            )
-            if created:
-                self.stdout.write(f"Created offering: {employer.name} - {plan.name}")
+        # Create employer offerings for plans not yet offered
+        new_offerings = load_offerings(
+            [
+                EmployerOffering(
+                    employer_id=employer.pk,
+                    plan_id=plan.pk,
+                    is_active=True,
+                    contribution_mode='percent',
+                    contribution_value=80.0,  # 80% employer contribution
+                )
+                for plan in plans
+            ],
+            batch_size
+        )
+        if verbose:
+            plan_names = {plan.pk: plan.name for plan in plans}
+            for offering in new_offerings:
+                self.stdout.write(f"Created offering: {employer.name} - {plan_names[offering.plan_id]}")
 
         # Create enrollment period
-        start_date = date.today()
-        end_date = start_date + timedelta(days=30)
-        effective_date = start_date + timedelta(days=45)
-
         enrollment_period, created = EnrollmentPeriod.objects.get_or_create(
             employer=employer,
             name='2024 Open Enrollment',
             defaults={
                 'period_type': 'open_enrollment',
                 'status': 'active',
-                'start_date': start_date,
-                'end_date': end_date,
-                'coverage_effective_date': effective_date,
+                'start_date': today,
+                'end_date': period_end_date,
+                'coverage_effective_date': coverage_effective_date,
                 'allow_waive': True,
                 'require_all_plans': False,
             }
@@ -175,27 +193,29 @@ class Command(BaseCommand):
             },
         ]
 
-        employees = []
-        for emp_data in employees_data:
-            employee, created = Employee.objects.get_or_create(
-                employer=employer,
-                employee_id=emp_data['employee_id'],
-                defaults=emp_data
-            )
-            employees.append(employee)
-            if created:
-                self.stdout.write(f"Created employee: {employee.first_name} {employee.last_name}")
-
-                # Create employee enrollment for the enrollment period
-                employee_enrollment, enrollment_created = EmployeeEnrollment.objects.get_or_create(
-                    employee=employee,
-                    enrollment_period=enrollment_period,
-                    defaults={
-                        'status': 'not_started',
-                    }
+        # Create the employees that don't exist yet, each with an enrollment for the period
+        employees, new_employees = load_employees(
+            [Employee(employer_id=employer.pk, **emp_data) for emp_data in employees_data],
+            batch_size,
+            fast
+        )
+        bulk_insert(
+            EmployeeEnrollment,
+            [
+                EmployeeEnrollment(
+                    employee_id=employee.pk,
+                    enrollment_period_id=enrollment_period.pk,
+                    status='not_started'
                 )
-                if enrollment_created:
-                    self.stdout.write(f"Created enrollment for: {employee.first_name} {employee.last_name}")
+                for employee in new_employees
+            ],
+            batch_size,
+            fast
+        )
+        if verbose:
+            for employee in new_employees:
+                self.stdout.write(f"Created employee: {employee.first_name} {employee.last_name}")
+                self.stdout.write(f"Created enrollment for: {employee.first_name} {employee.last_name}")
 
         self.stdout.write(self.style.SUCCESS('Successfully created enrollment test data!'))
         self.stdout.write(f"Created:")
@@ -206,4 +226,8 @@ class Command(BaseCommand):
         self.stdout.write(f"- {len(plans)} Employer Offerings")
         self.stdout.write(f"- 1 Enrollment Period: {enrollment_period.name}")
         self.stdout.write(f"- {len(employees)} Employees")
-        self.stdout.write(f"- {len(employees)} Employee Enrollments")
\ No newline at end of file
+        self.stdout.write(f"- {len(employees)} Employee Enrollments")
+
+        if options['dump']:
+            call_command('dumpdata', 'broker_console', indent=2, output=options['dump'])
+            self.stdout.write(f"Wrote fixture: {options['dump']}")
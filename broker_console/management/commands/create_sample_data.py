@@ -1,15 +1,56 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from datetime import date, timedelta
 from broker_console.models import (
-    Broker, Employer, Carrier, Plan, PlanPremium, EmployerOffering,
+    Broker, Employer, Carrier, Plan, EmployerOffering,
     Employee, Dependent
 )
+from broker_console.management._fixture_helpers import (
+    bulk_insert, load_carrier, load_employees, load_employers, load_offerings, load_plans
+)
 
 class Command(BaseCommand):
     help = 'Create sample data for testing the broker console'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Maximum rows per bulk INSERT (default: 500)',
+            default=500
+        )
+        parser.add_argument(
+            '--dump',
+            type=str,
+            metavar='PATH',
+            help='Also write the broker_console data to a JSON fixture for manage.py loaddata',
+        )
+        parser.add_argument(
+            '--fast',
+            action='store_true',
+            help='On PostgreSQL, load employee rows with COPY instead of INSERT',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Run every step even if the sample data is already present',
+        )
+
+    @transaction.atomic
     def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        fast = options['fast']
+        # Per-row progress lines are only written at --verbosity 2 or higher
+        verbose = options['verbosity'] >= 2
+
+        # The data is created in one transaction, so one sentinel row means it is all there
+        if not options['force'] and Employer.objects.filter(ein='12-3456789', name='TechStart Inc.').exists():
+            self.stdout.write('Sample data already present; use --force to check every row')
+            self.dump(options['dump'])
+            return
+
         self.stdout.write('Creating sample data...')
 
         # Create a sample broker
@@ -26,13 +67,7 @@ class Command(BaseCommand):
             self.stdout.write(f'Created broker: {broker.agency_name}')
 
         # Create Aetna carrier
-        aetna, created = Carrier.objects.get_or_create(
-            name='Aetna',
-            defaults={
-                'code': 'AETNA',
-                'is_active': True
-            }
-        )
+        aetna, created = load_carrier()
         if created:
             self.stdout.write(f'Created carrier: {aetna.name}')
 
@@ -84,28 +119,11 @@ class Command(BaseCommand):
             }
         ]
 
-        for plan_data in plans_data:
-            plan, created = Plan.objects.get_or_create(
-                carrier=aetna,
-                external_code=plan_data['external_code'],
-                defaults={
-                    'name': plan_data['name'],
-                    'plan_type': plan_data['plan_type'],
-                    'is_active': True
-                }
-            )
-            if created:
+        _, new_plans = load_plans(aetna, plans_data, date(2024, 1, 1), batch_size)
+        if verbose:
+            for plan in new_plans:
                 self.stdout.write(f'Created plan: {plan.name}')
 
-                # Create premiums for each tier
-                for tier, premium in plan_data['premiums'].items():
-                    PlanPremium.objects.create(
-                        plan=plan,
-                        coverage_tier=tier,
-                        monthly_premium=premium,
-                        effective_date=date(2024, 1, 1)
-                    )
-
         # Create sample employers
         employers_data = [
             {
@@ -146,66 +164,48 @@ class Command(BaseCommand):
             }
         ]
 
-        for emp_data in employers_data:
-            employer, created = Employer.objects.get_or_create(
-                ein=emp_data['ein'],
-                defaults={
-                    'broker': broker,
-                    'name': emp_data['name'],
-                    'size': emp_data['size'],
-                    'status': emp_data['status'],
-                    'effective_date': date(2024, 1, 1),
-                    'renewal_date': date(2024, 12, 31),
-                    'contact_name': emp_data['contact_name'],
-                    'contact_email': emp_data['contact_email'],
-                    'contact_phone': '(555) 000-0000',
-                    'address': emp_data['address']
-                }
-            )
-            if created:
-                self.stdout.write(f'Created employer: {employer.name}')
-
-                # Create sample offerings for active employers
-                if employer.status == 'active':
-                    medical_plan = Plan.objects.filter(carrier=aetna, plan_type='medical').first()
-                    dental_plan = Plan.objects.filter(carrier=aetna, plan_type='dental').first()
-                    vision_plan = Plan.objects.filter(carrier=aetna, plan_type='vision').first()
+        # Employer contribution (mode, value) for each offered plan type
+        offering_contributions = {
+            'medical': ('percent', 80.00),  # 80% employer contribution
+            'dental': ('full', 0.00),  # 100% employer paid
+            'vision': ('fixed', 10.00),  # $10 employer contribution
+        }
 
-                    if medical_plan:
-                        EmployerOffering.objects.get_or_create(
-                            employer=employer,
-                            plan=medical_plan,
-                            defaults={
-                                'is_active': True,
-                                'contribution_mode': 'percent',
-                                'contribution_value': 80.00  # 80% employer contribution
-                            }
-                        )
+        # First Aetna plan of each type, in the model's default ordering
+        plans_by_type = {}
+        for plan in Plan.objects.filter(carrier=aetna):
+            plans_by_type.setdefault(plan.plan_type, plan)
 
-                    if dental_plan:
-                        EmployerOffering.objects.get_or_create(
-                            employer=employer,
-                            plan=dental_plan,
-                            defaults={
-                                'is_active': True,
-                                'contribution_mode': 'full',
-                                'contribution_value': 0.00  # 100% employer paid
-                            }
-                        )
-
-                    if vision_plan:
-                        EmployerOffering.objects.get_or_create(
-                            employer=employer,
-                            plan=vision_plan,
-                            defaults={
-                                'is_active': True,
-                                'contribution_mode': 'fixed',
-                                'contribution_value': 10.00  # $10 employer contribution
-                            }
-                        )
+        # Create the employers that don't exist yet, with offerings for the new active ones
+        _, new_employers = load_employers(
+            employers_data,
+            batch_size,
+            broker_id=broker.pk,
+            effective_date=date(2024, 1, 1),
+            renewal_date=date(2024, 12, 31),
+            contact_phone='(555) 000-0000'
+        )
+        load_offerings(
+            [
+                EmployerOffering(
+                    employer_id=employer.pk,
+                    plan_id=plans_by_type[plan_type].pk,
+                    is_active=True,
+                    contribution_mode=mode,
+                    contribution_value=value
+                )
+                for employer in new_employers if employer.status == 'active'
+                for plan_type, (mode, value) in offering_contributions.items()
+                if plan_type in plans_by_type
+            ],
+            batch_size
+        )
+        if verbose:
+            for employer in new_employers:
+                self.stdout.write(f'Created employer: {employer.name}')
 
         # Create sample employees for the first two employers
-        active_employers = Employer.objects.filter(status='active')[:2]
+        active_employers = list(Employer.objects.filter(status='active')[:2])
         
         employees_data = [
             {
@@ -279,66 +279,63 @@ class Command(BaseCommand):
             }
         ]
         
-        for i, emp_data in enumerate(employees_data):
-            # Assign to different employers
-            employer = active_employers[i % len(active_employers)]
-            
-            employee, created = Employee.objects.get_or_create(
-                employer=employer,
-                employee_id=emp_data['employee_id'],
-                defaults=emp_data
-            )
-            if created:
+        # Dependents for married employees, keyed by employee_id
+        dependents_data = {
+            'EMP001': [
+                {
+                    'first_name': 'Mary',
+                    'last_name': 'Smith',
+                    'date_of_birth': date(1987, 5, 20),
+                    'gender': 'F',
+                    'relationship': 'spouse',
+                    'ssn': '111-22-3333'
+                },
+                {
+                    'first_name': 'Tommy',
+                    'last_name': 'Smith',
+                    'date_of_birth': date(2015, 8, 12),
+                    'gender': 'M',
+                    'relationship': 'child',
+                    'ssn': '444-55-6666'
+                }
+            ],
+            'EMP003': [
+                {
+                    'first_name': 'Sarah',
+                    'last_name': 'Johnson',
+                    'date_of_birth': date(1984, 9, 15),
+                    'gender': 'F',
+                    'relationship': 'spouse',
+                    'ssn': '777-88-9999'
+                }
+            ]
+        }
+
+        # Assign employees to the active employers in turn
+        _, new_employees = load_employees(
+            [
+                Employee(employer_id=active_employers[i % len(active_employers)].pk, **emp_data)
+                for i, emp_data in enumerate(employees_data)
+            ],
+            batch_size,
+            fast
+        )
+
+        new_dependents = []
+        for employee in new_employees:
+            if verbose:
                 self.stdout.write(f'Created employee: {employee.first_name} {employee.last_name}')
-                
-                # Create dependents for married employees
-                if employee.marital_status == 'married':
-                    if employee.first_name == 'John':
-                        # Create spouse and child
-                        Dependent.objects.get_or_create(
-                            employee=employee,
-                            first_name='Mary',
-                            last_name='Smith',
-                            date_of_birth=date(1987, 5, 20),
-                            gender='F',
-                            relationship='spouse',
-                            defaults={
-                                'ssn': '111-22-3333',
-                                'medical_coverage': True,
-                                'dental_coverage': True,
-                                'vision_coverage': True
-                            }
-                        )
-                        Dependent.objects.get_or_create(
-                            employee=employee,
-                            first_name='Tommy',
-                            last_name='Smith',
-                            date_of_birth=date(2015, 8, 12),
-                            gender='M',
-                            relationship='child',
-                            defaults={
-                                'ssn': '444-55-6666',
-                                'medical_coverage': True,
-                                'dental_coverage': True,
-                                'vision_coverage': True
-                            }
-                        )
-                    elif employee.first_name == 'Michael':
-                        # Create spouse only
-                        Dependent.objects.get_or_create(
-                            employee=employee,
-                            first_name='Sarah',
-                            last_name='Johnson',
-                            date_of_birth=date(1984, 9, 15),
-                            gender='F',
-                            relationship='spouse',
-                            defaults={
-                                'ssn': '777-88-9999',
-                                'medical_coverage': True,
-                                'dental_coverage': True,
-                                'vision_coverage': True
-                            }
-                        )
+            new_dependents.extend(
+                Dependent(
+                    employee_id=employee.pk,
+                    medical_coverage=True,
+                    dental_coverage=True,
+                    vision_coverage=True,
+                    **dep_data
+                )
+                for dep_data in dependents_data.get(employee.employee_id, [])
+            )
+        bulk_insert(Dependent, new_dependents, batch_size, fast)
 
         self.stdout.write(
             self.style.SUCCESS('Successfully created sample data!')
@@ -350,4 +347,12 @@ class Command(BaseCommand):
         self.stdout.write(f'  - {Employer.objects.count()} employers')
         self.stdout.write(f'  - {EmployerOffering.objects.count()} employer offerings')
         self.stdout.write(f'  - {Employee.objects.count()} employees')
-        self.stdout.write(f'  - {Dependent.objects.count()} dependents')
\ No newline at end of file
+        self.stdout.write(f'  - {Dependent.objects.count()} dependents')
+
+        self.dump(options['dump'])
+
+    def dump(self, path):
+        """Write the broker_console data to a JSON fixture at path, if given."""
+        if path:
+            call_command('dumpdata', 'broker_console', indent=2, output=path)
+            self.stdout.write(f"Wrote fixture: {path}")
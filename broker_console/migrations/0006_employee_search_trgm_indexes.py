@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Columns matched with icontains by the employees dashboard search. On
+# PostgreSQL, icontains compiles to UPPER("col"::text) LIKE UPPER(%s), so the
+# trigram indexes are built over that same expression.
+EMPLOYEE_SEARCH_COLUMNS = ['first_name', 'last_name', 'email', 'employee_id']
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in EMPLOYEE_SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS broker_console_employee_{column}_trgm '
+            f'ON broker_console_employee USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in EMPLOYEE_SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS broker_console_employee_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0005_employeeportaluser'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0006_employee_search_trgm_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeeformsubmission',
+            index=models.Index(fields=['employer', 'status', '-created_at'], name='efs_emp_stat_ct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeeformsubmission',
+            index=models.Index(fields=['created_at'], name='efs_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# Columns matched with icontains by the employer forms search. Indexed over
+# UPPER("col"::text) to match PostgreSQL's icontains expression, as in 0006.
+SUBMISSION_SEARCH_COLUMNS = ['first_name', 'last_name', 'email']
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SUBMISSION_SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS broker_console_efs_{column}_trgm '
+            f'ON broker_console_employeeformsubmission USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SUBMISSION_SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS broker_console_efs_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0007_employeeformsubmission_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
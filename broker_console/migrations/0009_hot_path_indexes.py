@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0008_employeeformsubmission_search_trgm_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carrier',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name'], name='carrier_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['employer', 'last_name', 'first_name'], name='employee_emp_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['employer', 'employment_status'], name='employee_emp_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employer',
+            index=models.Index(fields=['broker', 'status'], name='employer_broker_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeroffering',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['employer'], name='offering_active_employer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollmentevent',
+            index=models.Index(fields=['employee', '-effective_date'], name='event_emp_eff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollmentevent',
+            index=models.Index(fields=['employee', 'event_type', '-effective_date'], name='event_emp_type_eff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exportjob',
+            index=models.Index(fields=['employer', 'status', '-created_at'], name='export_emp_stat_ct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plan',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['plan_type', 'name'], name='plan_active_type_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='planpremium',
+            index=models.Index(fields=['plan', 'coverage_tier', 'effective_date'], name='premium_plan_tier_eff_idx'),
+        ),
+    ]
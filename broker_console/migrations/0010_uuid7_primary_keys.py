@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:10
+
+import broker_console.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='broker',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='brokeruser',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='carrier',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='carriercsvtemplate',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='dependent',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='employeeenrollment',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='employeeformsubmission',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='employeeportaluser',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='employer',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='employeroffering',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='enrollmentevent',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='enrollmentperiod',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='exportjob',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='plan',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='planenrollment',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='planpremium',
+            name='id',
+            field=models.UUIDField(default=broker_console.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0010_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='planenrollment',
+            name='monthly_premium',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text="Filled from the plan's PlanPremium for the tier when left blank", max_digits=10),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0011_planenrollment_premium_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='brokeruser',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='employee',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='employeeenrollment',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='employeroffering',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='plan',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='planenrollment',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='brokeruser',
+            constraint=models.UniqueConstraint(fields=('user', 'broker'), name='brokeruser_user_broker_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='dependent',
+            constraint=models.CheckConstraint(condition=models.Q(('gender__in', ['M', 'F'])), name='dependent_gender_valid'),
+        ),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.UniqueConstraint(fields=('employer', 'employee_id'), name='employee_employer_empid_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.CheckConstraint(condition=models.Q(('gender__in', ['M', 'F'])), name='employee_gender_valid'),
+        ),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.CheckConstraint(condition=models.Q(('hours_per_week__gte', 0), ('hours_per_week__lte', 168)), name='employee_hours_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='employeeenrollment',
+            constraint=models.UniqueConstraint(fields=('employee', 'enrollment_period'), name='enrollment_employee_period_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='employeeenrollment',
+            constraint=models.CheckConstraint(condition=models.Q(('status__in', ['not_started', 'in_progress', 'submitted', 'approved', 'declined', 'expired'])), name='enrollment_status_valid'),
+        ),
+        migrations.AddConstraint(
+            model_name='employer',
+            constraint=models.CheckConstraint(condition=models.Q(('size__gte', 1), ('size__lte', 100)), name='employer_size_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='employer',
+            constraint=models.CheckConstraint(condition=models.Q(('status__in', ['pending', 'active', 'terminated'])), name='employer_status_valid'),
+        ),
+        migrations.AddConstraint(
+            model_name='employeroffering',
+            constraint=models.UniqueConstraint(fields=('employer', 'plan'), name='offering_employer_plan_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='exportjob',
+            constraint=models.CheckConstraint(condition=models.Q(('status__in', ['pending', 'processing', 'completed', 'failed'])), name='exportjob_status_valid'),
+        ),
+        migrations.AddConstraint(
+            model_name='plan',
+            constraint=models.UniqueConstraint(fields=('carrier', 'external_code'), name='plan_carrier_code_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='planenrollment',
+            constraint=models.UniqueConstraint(fields=('employee_enrollment', 'plan'), name='planenrollment_enr_plan_uniq'),
+        ),
+    ]
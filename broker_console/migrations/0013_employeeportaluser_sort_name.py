@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:14
+
+from django.db import migrations, models
+
+
+def fill_sort_name(apps, schema_editor):
+    EmployeePortalUser = apps.get_model('broker_console', 'EmployeePortalUser')
+    portal_users = EmployeePortalUser.objects.select_related('employee', 'form_submission')
+    for portal_user in portal_users.iterator():
+        person = portal_user.employee or portal_user.form_submission
+        if person:
+            portal_user.sort_name = f"{person.last_name}, {person.first_name}"
+            portal_user.save(update_fields=['sort_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0012_unique_and_check_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeeportaluser',
+            name='sort_name',
+            field=models.CharField(blank=True, db_index=True, max_length=202),
+        ),
+        migrations.RunPython(fill_sort_name, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# A plan can have only one premium per coverage tier in effect on any date.
+# ExclusionConstraint is PostgreSQL-only, so it is added with raw SQL here
+# rather than in PlanPremium.Meta, which SQLite would also have to build.
+# A NULL end_date leaves the range open-ended.
+
+
+def create_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.execute(
+        'ALTER TABLE broker_console_planpremium ADD CONSTRAINT planpremium_no_overlap '
+        'EXCLUDE USING gist (plan_id WITH =, coverage_tier WITH =, '
+        "daterange(effective_date, end_date, '[]') WITH &&)"
+    )
+
+
+def drop_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'ALTER TABLE broker_console_planpremium DROP CONSTRAINT IF EXISTS planpremium_no_overlap'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0013_employeeportaluser_sort_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_exclusion_constraint, drop_exclusion_constraint),
+    ]
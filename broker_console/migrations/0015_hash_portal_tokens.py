@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:16
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_tokens(apps, schema_editor):
+    EmployeePortalUser = apps.get_model('broker_console', 'EmployeePortalUser')
+    token_fields = ['password_reset_token', 'email_verification_token']
+    for portal_user in EmployeePortalUser.objects.exclude(password_reset_token='', email_verification_token=''):
+        for field in token_fields:
+            raw_token = getattr(portal_user, field)
+            if raw_token:
+                setattr(portal_user, field, hashlib.sha256(raw_token.encode()).hexdigest())
+        portal_user.save(update_fields=token_fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0014_planpremium_no_overlap'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employeeportaluser',
+            name='password_reset_token',
+            field=models.CharField(blank=True, db_index=True, max_length=255),
+        ),
+        migrations.RunPython(hash_existing_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0015_hash_portal_tokens'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='employeroffering',
+            name='offering_active_employer_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='plan',
+            name='plan_active_type_name_idx',
+        ),
+        migrations.AddIndex(
+            model_name='employeroffering',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['employer'], include=('plan', 'contribution_mode', 'contribution_value'), name='offering_active_employer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plan',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['plan_type', 'name'], include=('carrier', 'external_code'), name='plan_active_type_name_idx'),
+        ),
+    ]
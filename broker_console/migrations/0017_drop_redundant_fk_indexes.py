@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0016_covering_active_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='brokeruser',
+            name='brokeruser_user_broker_uniq',
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='employer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='employees', to='broker_console.employer'),
+        ),
+        migrations.AlterField(
+            model_name='employeeenrollment',
+            name='employee',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='broker_console.employee'),
+        ),
+        migrations.AlterField(
+            model_name='employeeformsubmission',
+            name='employer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='form_submissions', to='broker_console.employer'),
+        ),
+        migrations.AlterField(
+            model_name='employer',
+            name='broker',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='employers', to='broker_console.broker'),
+        ),
+        migrations.AlterField(
+            model_name='employeroffering',
+            name='employer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='offerings', to='broker_console.employer'),
+        ),
+        migrations.AlterField(
+            model_name='enrollmentevent',
+            name='employee',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='enrollment_events', to='broker_console.employee'),
+        ),
+        migrations.AlterField(
+            model_name='exportjob',
+            name='employer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to='broker_console.employer'),
+        ),
+        migrations.AlterField(
+            model_name='plan',
+            name='carrier',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='plans', to='broker_console.carrier'),
+        ),
+        migrations.AlterField(
+            model_name='planenrollment',
+            name='employee_enrollment',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='plan_enrollments', to='broker_console.employeeenrollment'),
+        ),
+        migrations.AlterField(
+            model_name='planpremium',
+            name='plan',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='premiums', to='broker_console.plan'),
+        ),
+    ]
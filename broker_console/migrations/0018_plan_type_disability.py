@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0017_drop_redundant_fk_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='carriercsvtemplate',
+            name='coverage_type',
+            field=models.CharField(choices=[('medical', 'Medical'), ('dental', 'Dental'), ('vision', 'Vision'), ('life', 'Life/AD&D'), ('disability', 'Disability')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='exportjob',
+            name='coverage_type',
+            field=models.CharField(choices=[('medical', 'Medical'), ('dental', 'Dental'), ('vision', 'Vision'), ('life', 'Life/AD&D'), ('disability', 'Disability')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='plan',
+            name='plan_type',
+            field=models.CharField(choices=[('medical', 'Medical'), ('dental', 'Dental'), ('vision', 'Vision'), ('life', 'Life/AD&D'), ('disability', 'Disability')], max_length=20),
+        ),
+    ]
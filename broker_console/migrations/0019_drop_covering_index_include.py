@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+# 0016 added INCLUDE columns to the active plan and offering indexes, which
+# only PostgreSQL builds and which no query reads as an index-only scan (the
+# plan and offering lists select full rows with joins). Rebuild them as plain
+# partial indexes so the migration state matches the database everywhere.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker_console', '0018_plan_type_disability'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='employeroffering',
+            name='offering_active_employer_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='plan',
+            name='plan_active_type_name_idx',
+        ),
+        migrations.AddIndex(
+            model_name='employeroffering',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['employer'], name='offering_active_employer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plan',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['plan_type', 'name'], name='plan_active_type_name_idx'),
+        ),
+    ]
@@ -1,21 +1,108 @@
 from django.db import models
+from django.db.models import Count, Q, Sum
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password as _check_password, make_password
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import cached_property
+from datetime import timedelta
+import hashlib
+import os
+import secrets
+import time
 import uuid
 
 User = get_user_model()
 
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562 version 7): a 48-bit Unix millisecond
+    timestamp followed by random bits, so new primary keys land at the end
+    of the index instead of on random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
 class TimeStampedModel(models.Model):
     """Base model with created_at and updated_at fields"""
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    def save(self, *args, update_fields=None, **kwargs):
+        # Partial saves still bump updated_at, so callers only list the fields they changed
+        if update_fields is not None and 'updated_at' not in update_fields:
+            update_fields = [*update_fields, 'updated_at']
+        super().save(*args, update_fields=update_fields, **kwargs)
+    
     class Meta:
         abstract = True
 
-class Broker(TimeStampedModel):
+class UUIDModel(TimeStampedModel):
+    """Base model with a time-ordered UUID primary key"""
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    
+    class Meta:
+        abstract = True
+
+class EmployeeManager(models.Manager):
+    """
+    Joins the employer, which the employee APIs and exports render per row.
+    Use plain_objects for only()/defer() projections: deferring the employer
+    raises FieldError ("cannot be both deferred and traversed"). Reverse
+    managers such as employer.employees join it too, redundantly.
+    """
+    def get_queryset(self):
+        return super().get_queryset().select_related('employer')
+
+class EmployeeEnrollmentQuerySet(models.QuerySet):
+    def with_enrolled_totals(self):
+        """
+        Annotate enrolled_plan_count and enrolled_contribution_total (the
+        employee contribution summed over plan enrollments with status
+        'enrolled', None when there are none) in the same query.
+        """
+        enrolled = Q(plan_enrollments__status='enrolled')
+        return self.annotate(
+            enrolled_plan_count=Count('plan_enrollments', filter=enrolled),
+            enrolled_contribution_total=Sum('plan_enrollments__employee_contribution', filter=enrolled),
+        )
+
+class EmployeeEnrollmentManager(models.Manager.from_queryset(EmployeeEnrollmentQuerySet)):
+    """
+    Joins the employee and enrollment period used by __str__ and the
+    serializers. Use plain_objects for only()/defer() projections, which
+    cannot defer a joined field, and reverse managers such as
+    employee.enrollments join both as well.
+    """
+    def get_queryset(self):
+        return super().get_queryset().select_related('employee', 'enrollment_period')
+
+class PlanEnrollmentManager(models.Manager):
+    """
+    Joins the employee and plan/carrier used by __str__ and the serializers.
+    Use plain_objects for only()/defer() projections, which cannot defer a
+    joined field, and reverse managers such as
+    employee_enrollment.plan_enrollments join them as well.
+    """
+    def get_queryset(self):
+        return super().get_queryset().select_related('employee_enrollment__employee', 'plan__carrier')
+
+class EnrollmentEventManager(models.Manager):
+    """
+    Joins the employee used by __str__. The nullable plan_enrollment and
+    processed_by are left out: an outer join would make select_for_update()
+    fail on PostgreSQL. Use plain_objects for only()/defer() projections,
+    which cannot defer the joined employee, and employee.enrollment_events
+    joins it as well.
+    """
+    def get_queryset(self):
+        return super().get_queryset().select_related('employee')
+
+class Broker(UUIDModel):
     """Broker/Agency model"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     agency_name = models.CharField(max_length=255)
     license_number = models.CharField(max_length=100, blank=True)
     phone = models.CharField(max_length=20, blank=True)
@@ -28,14 +115,13 @@ class Broker(TimeStampedModel):
     class Meta:
         ordering = ['agency_name']
 
-class BrokerUser(TimeStampedModel):
+class BrokerUser(UUIDModel):
     """Users belonging to a broker"""
     ROLE_CHOICES = [
         ('admin', 'Admin'),
         ('user', 'User'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     broker = models.ForeignKey(Broker, on_delete=models.CASCADE, related_name='users')
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='user')
@@ -43,11 +129,8 @@ class BrokerUser(TimeStampedModel):
     
     def __str__(self):
         return f"{self.user.email} ({self.broker.agency_name})"
-    
-    class Meta:
-        unique_together = ['user', 'broker']
 
-class Employer(TimeStampedModel):
+class Employer(UUIDModel):
     """Employer/Company model"""
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -55,8 +138,7 @@ class Employer(TimeStampedModel):
         ('terminated', 'Terminated'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    broker = models.ForeignKey(Broker, on_delete=models.CASCADE, related_name='employers')
+    broker = models.ForeignKey(Broker, on_delete=models.CASCADE, related_name='employers', db_index=False)
     name = models.CharField(max_length=255)
     ein = models.CharField(max_length=11, unique=True, help_text="Format: XX-XXXXXXX")
     size = models.IntegerField(
@@ -76,12 +158,26 @@ class Employer(TimeStampedModel):
     def __str__(self):
         return f"{self.name} ({self.size} employees)"
     
+    def stream_census(self, fields, chunk_size=2000):
+        """
+        Iterate over this employer's employees loading only the given fields,
+        fetching chunk_size rows at a time (a server-side cursor on PostgreSQL)
+        instead of materializing the whole result.
+        """
+        return Employee.plain_objects.filter(employer=self).only(*fields).iterator(chunk_size=chunk_size)
+    
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['broker', 'status'], name='employer_broker_status_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=Q(size__gte=1, size__lte=100), name='employer_size_range'),
+            models.CheckConstraint(condition=Q(status__in=['pending', 'active', 'terminated']), name='employer_status_valid'),
+        ]
 
-class Carrier(TimeStampedModel):
+class Carrier(UUIDModel):
     """Insurance carriers (Aetna, etc.)"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100, unique=True)
     code = models.CharField(max_length=10, unique=True)
     is_active = models.BooleanField(default=True)
@@ -91,14 +187,18 @@ class Carrier(TimeStampedModel):
     
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name'], condition=Q(is_active=True), name='carrier_active_name_idx'),
+        ]
 
-class Plan(TimeStampedModel):
+class Plan(UUIDModel):
     """Insurance plans offered by carriers"""
     PLAN_TYPES = [
         ('medical', 'Medical'),
         ('dental', 'Dental'),
         ('vision', 'Vision'),
         ('life', 'Life/AD&D'),
+        ('disability', 'Disability'),
     ]
     
     COVERAGE_TIERS = [
@@ -108,8 +208,7 @@ class Plan(TimeStampedModel):
         ('family', 'Family'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    carrier = models.ForeignKey(Carrier, on_delete=models.CASCADE, related_name='plans')
+    carrier = models.ForeignKey(Carrier, on_delete=models.CASCADE, related_name='plans', db_index=False)
     name = models.CharField(max_length=255)
     plan_type = models.CharField(max_length=20, choices=PLAN_TYPES)
     external_code = models.CharField(max_length=50, help_text="Carrier's plan code")
@@ -120,12 +219,16 @@ class Plan(TimeStampedModel):
     
     class Meta:
         ordering = ['carrier__name', 'plan_type', 'name']
-        unique_together = ['carrier', 'external_code']
+        constraints = [
+            models.UniqueConstraint(fields=['carrier', 'external_code'], name='plan_carrier_code_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['plan_type', 'name'], condition=Q(is_active=True), name='plan_active_type_name_idx'),
+        ]
 
-class PlanPremium(TimeStampedModel):
+class PlanPremium(UUIDModel):
     """Premium rates for plans by coverage tier"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    plan = models.ForeignKey(Plan, on_delete=models.CASCADE, related_name='premiums')
+    plan = models.ForeignKey(Plan, on_delete=models.CASCADE, related_name='premiums', db_index=False)
     coverage_tier = models.CharField(max_length=20, choices=Plan.COVERAGE_TIERS)
     monthly_premium = models.DecimalField(max_digits=10, decimal_places=2)
     effective_date = models.DateField()
@@ -136,8 +239,11 @@ class PlanPremium(TimeStampedModel):
     
     class Meta:
         ordering = ['plan', 'coverage_tier', 'effective_date']
+        indexes = [
+            models.Index(fields=['plan', 'coverage_tier', 'effective_date'], name='premium_plan_tier_eff_idx'),
+        ]
 
-class EmployerOffering(TimeStampedModel):
+class EmployerOffering(UUIDModel):
     """Plans offered by an employer with contribution settings"""
     CONTRIBUTION_MODES = [
         ('full', 'Full (100%)'),
@@ -145,8 +251,7 @@ class EmployerOffering(TimeStampedModel):
         ('fixed', 'Fixed Amount'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='offerings')
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='offerings', db_index=False)
     plan = models.ForeignKey(Plan, on_delete=models.CASCADE)
     is_active = models.BooleanField(default=True)
     
@@ -163,12 +268,16 @@ class EmployerOffering(TimeStampedModel):
         return f"{self.employer.name} - {self.plan.name}"
     
     class Meta:
-        unique_together = ['employer', 'plan']
         ordering = ['employer', 'plan']
+        constraints = [
+            models.UniqueConstraint(fields=['employer', 'plan'], name='offering_employer_plan_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['employer'], condition=Q(is_active=True), name='offering_active_employer_idx'),
+        ]
 
-class CarrierCsvTemplate(TimeStampedModel):
+class CarrierCsvTemplate(UUIDModel):
     """CSV export templates for different carriers"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     carrier = models.ForeignKey(Carrier, on_delete=models.CASCADE, related_name='csv_templates')
     name = models.CharField(max_length=100)
     coverage_type = models.CharField(max_length=20, choices=Plan.PLAN_TYPES)
@@ -181,7 +290,7 @@ class CarrierCsvTemplate(TimeStampedModel):
     class Meta:
         ordering = ['carrier', 'coverage_type', 'name']
 
-class ExportJob(TimeStampedModel):
+class ExportJob(UUIDModel):
     """Track export job status and errors"""
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -190,8 +299,7 @@ class ExportJob(TimeStampedModel):
         ('failed', 'Failed'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='export_jobs')
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='export_jobs', db_index=False)
     carrier = models.ForeignKey(Carrier, on_delete=models.CASCADE)
     coverage_type = models.CharField(max_length=20, choices=Plan.PLAN_TYPES)
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='pending')
@@ -204,8 +312,17 @@ class ExportJob(TimeStampedModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['employer', 'status', '-created_at'], name='export_emp_stat_ct_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(status__in=['pending', 'processing', 'completed', 'failed']),
+                name='exportjob_status_valid'
+            ),
+        ]
 
-class Employee(TimeStampedModel):
+class Employee(UUIDModel):
     """Employee records for census export"""
     GENDER_CHOICES = [
         ('M', 'Male'),
@@ -226,8 +343,7 @@ class Employee(TimeStampedModel):
         ('family', 'Family'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='employees')
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='employees', db_index=False)
     
     # Personal Information
     employee_id = models.CharField(max_length=50, help_text="Employer's employee ID")
@@ -261,14 +377,26 @@ class Employee(TimeStampedModel):
     dental_coverage_tier = models.CharField(max_length=20, choices=COVERAGE_TIER_CHOICES, blank=True)
     vision_coverage_tier = models.CharField(max_length=20, choices=COVERAGE_TIER_CHOICES, blank=True)
     
+    objects = EmployeeManager()
+    # Unjoined manager for write paths and only()/defer() projections
+    plain_objects = models.Manager()
+    
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.employee_id})"
     
     class Meta:
         ordering = ['employer', 'last_name', 'first_name']
-        unique_together = ['employer', 'employee_id']
+        constraints = [
+            models.UniqueConstraint(fields=['employer', 'employee_id'], name='employee_employer_empid_uniq'),
+            models.CheckConstraint(condition=Q(gender__in=['M', 'F']), name='employee_gender_valid'),
+            models.CheckConstraint(condition=Q(hours_per_week__gte=0, hours_per_week__lte=168), name='employee_hours_range'),
+        ]
+        indexes = [
+            models.Index(fields=['employer', 'last_name', 'first_name'], name='employee_emp_name_idx'),
+            models.Index(fields=['employer', 'employment_status'], name='employee_emp_status_idx'),
+        ]
 
-class Dependent(TimeStampedModel):
+class Dependent(UUIDModel):
     """Employee dependents for coverage"""
     RELATIONSHIP_CHOICES = [
         ('spouse', 'Spouse'),
@@ -281,7 +409,6 @@ class Dependent(TimeStampedModel):
         ('F', 'Female'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='dependents')
     
     first_name = models.CharField(max_length=100)
@@ -302,8 +429,11 @@ class Dependent(TimeStampedModel):
     
     class Meta:
         ordering = ['employee', 'relationship', 'last_name']
+        constraints = [
+            models.CheckConstraint(condition=Q(gender__in=['M', 'F']), name='dependent_gender_valid'),
+        ]
 
-class EnrollmentPeriod(TimeStampedModel):
+class EnrollmentPeriod(UUIDModel):
     """Open enrollment or qualifying event periods"""
     PERIOD_TYPES = [
         ('open_enrollment', 'Open Enrollment'),
@@ -319,7 +449,6 @@ class EnrollmentPeriod(TimeStampedModel):
         ('cancelled', 'Cancelled'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='enrollment_periods')
     name = models.CharField(max_length=255)
     period_type = models.CharField(max_length=20, choices=PERIOD_TYPES)
@@ -340,7 +469,7 @@ class EnrollmentPeriod(TimeStampedModel):
     class Meta:
         ordering = ['-coverage_effective_date', 'employer']
 
-class EmployeeEnrollment(TimeStampedModel):
+class EmployeeEnrollment(UUIDModel):
     """Employee's enrollment in a specific enrollment period"""
     STATUS_CHOICES = [
         ('not_started', 'Not Started'),
@@ -351,8 +480,7 @@ class EmployeeEnrollment(TimeStampedModel):
         ('expired', 'Expired'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='enrollments')
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='enrollments', db_index=False)
     enrollment_period = models.ForeignKey(EnrollmentPeriod, on_delete=models.CASCADE, related_name='employee_enrollments')
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='not_started')
     
@@ -367,14 +495,23 @@ class EmployeeEnrollment(TimeStampedModel):
     waived_coverage = models.BooleanField(default=False)
     waiver_reason = models.TextField(blank=True)
     
+    objects = EmployeeEnrollmentManager()
+    plain_objects = models.Manager()
+    
     def __str__(self):
         return f"{self.employee} - {self.enrollment_period.name} ({self.status})"
     
     class Meta:
-        unique_together = ['employee', 'enrollment_period']
         ordering = ['-enrollment_period__coverage_effective_date', 'employee']
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'enrollment_period'], name='enrollment_employee_period_uniq'),
+            models.CheckConstraint(
+                condition=Q(status__in=['not_started', 'in_progress', 'submitted', 'approved', 'declined', 'expired']),
+                name='enrollment_status_valid'
+            ),
+        ]
 
-class PlanEnrollment(TimeStampedModel):
+class PlanEnrollment(UUIDModel):
     """Employee's enrollment in a specific plan"""
     STATUS_CHOICES = [
         ('enrolled', 'Enrolled'),
@@ -383,14 +520,18 @@ class PlanEnrollment(TimeStampedModel):
         ('terminated', 'Terminated'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    employee_enrollment = models.ForeignKey(EmployeeEnrollment, on_delete=models.CASCADE, related_name='plan_enrollments')
+    employee_enrollment = models.ForeignKey(EmployeeEnrollment, on_delete=models.CASCADE, related_name='plan_enrollments', db_index=False)
     plan = models.ForeignKey(Plan, on_delete=models.CASCADE)
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='enrolled')
     
     # Coverage details
     coverage_tier = models.CharField(max_length=20, choices=Plan.COVERAGE_TIERS)
-    monthly_premium = models.DecimalField(max_digits=10, decimal_places=2)
+    monthly_premium = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        blank=True,
+        help_text="Filled from the plan's PlanPremium for the tier when left blank"
+    )
     employee_contribution = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     employer_contribution = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     
@@ -401,14 +542,19 @@ class PlanEnrollment(TimeStampedModel):
     # Covered dependents
     covered_dependents = models.ManyToManyField(Dependent, blank=True, help_text="Dependents covered under this enrollment")
     
+    objects = PlanEnrollmentManager()
+    plain_objects = models.Manager()
+    
     def __str__(self):
         return f"{self.employee_enrollment.employee} - {self.plan.name} ({self.status})"
     
     class Meta:
-        unique_together = ['employee_enrollment', 'plan']
         ordering = ['employee_enrollment', 'plan']
+        constraints = [
+            models.UniqueConstraint(fields=['employee_enrollment', 'plan'], name='planenrollment_enr_plan_uniq'),
+        ]
 
-class EnrollmentEvent(TimeStampedModel):
+class EnrollmentEvent(UUIDModel):
     """Track enrollment events and changes"""
     EVENT_TYPES = [
         ('enrollment', 'New Enrollment'),
@@ -420,8 +566,7 @@ class EnrollmentEvent(TimeStampedModel):
         ('waiver', 'Coverage Waived'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='enrollment_events')
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='enrollment_events', db_index=False)
     event_type = models.CharField(max_length=20, choices=EVENT_TYPES)
     effective_date = models.DateField()
     
@@ -435,13 +580,20 @@ class EnrollmentEvent(TimeStampedModel):
     processed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     processed_at = models.DateTimeField(auto_now_add=True)
     
+    objects = EnrollmentEventManager()
+    plain_objects = models.Manager()
+    
     def __str__(self):
         return f"{self.employee} - {self.event_type} ({self.effective_date})"
     
     class Meta:
         ordering = ['-effective_date', '-processed_at']
+        indexes = [
+            models.Index(fields=['employee', '-effective_date'], name='event_emp_eff_idx'),
+            models.Index(fields=['employee', 'event_type', '-effective_date'], name='event_emp_type_eff_idx'),
+        ]
 
-class EmployeeFormSubmission(TimeStampedModel):
+class EmployeeFormSubmission(UUIDModel):
     """Employee form submissions for employer review"""
     STATUS_CHOICES = [
         ('pending', 'Pending Review'),
@@ -450,8 +602,7 @@ class EmployeeFormSubmission(TimeStampedModel):
         ('changes_requested', 'Changes Requested'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='form_submissions')
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='form_submissions', db_index=False)
     
     # Employee Information
     first_name = models.CharField(max_length=100)
@@ -494,10 +645,13 @@ class EmployeeFormSubmission(TimeStampedModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['employer', 'status', '-created_at'], name='efs_emp_stat_ct_idx'),
+            models.Index(fields=['created_at'], name='efs_created_at_idx'),
+        ]
 
-class EmployeePortalUser(TimeStampedModel):
+class EmployeePortalUser(UUIDModel):
     """Portal access for employees to check their status and manage profile"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     employee = models.OneToOneField(Employee, on_delete=models.CASCADE, null=True, blank=True, related_name='portal_user')
     form_submission = models.OneToOneField(EmployeeFormSubmission, on_delete=models.CASCADE, null=True, blank=True, related_name='portal_user')
     
@@ -508,24 +662,84 @@ class EmployeePortalUser(TimeStampedModel):
     # Access control
     is_active = models.BooleanField(default=True)
     last_login = models.DateTimeField(null=True, blank=True)
-    password_reset_token = models.CharField(max_length=255, blank=True)
+    # Tokens are stored as SHA-256 hex digests; the raw value is only handed out once
+    password_reset_token = models.CharField(max_length=255, blank=True, db_index=True)
     password_reset_expires = models.DateTimeField(null=True, blank=True)
     
     # Verification status
     email_verified = models.BooleanField(default=False)
     email_verification_token = models.CharField(max_length=255, blank=True)
     
+    # "Last, First" of the linked employee or form submission, kept in sync by
+    # broker_console.signals so portal users can be sorted and searched without a join
+    sort_name = models.CharField(max_length=202, blank=True, db_index=True)
+    
+    @staticmethod
+    def sort_name_for(person):
+        return f"{person.last_name}, {person.first_name}"
+    
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is None:
+            person = self.employee or self.form_submission
+            self.sort_name = self.sort_name_for(person) if person else ''
+        super().save(*args, **kwargs)
+    
     def set_password(self, raw_password):
-        """Hash and set password"""
-        import hashlib
-        self.password_hash = hashlib.sha256(raw_password.encode()).hexdigest()
+        """Hash and set password with the configured PASSWORD_HASHERS"""
+        self.password_hash = make_password(raw_password)
     
     def check_password(self, raw_password):
-        """Check if provided password matches stored hash"""
-        import hashlib
-        return self.password_hash == hashlib.sha256(raw_password.encode()).hexdigest()
-    
-    @property
+        """
+        Check if provided password matches stored hash. Legacy unsalted
+        SHA-256 hashes are accepted once and rehashed in place.
+        """
+        if len(self.password_hash) == 64 and '$' not in self.password_hash:
+            legacy_hash = hashlib.sha256(raw_password.encode()).hexdigest()
+            if not constant_time_compare(self.password_hash, legacy_hash):
+                return False
+            self._rehash_password(raw_password)
+            return True
+        return _check_password(raw_password, self.password_hash, setter=self._rehash_password)
+    
+    def _rehash_password(self, raw_password):
+        self.set_password(raw_password)
+        if self.pk:
+            self.save(update_fields=['password_hash'])
+    
+    @staticmethod
+    def hash_token(raw_token):
+        return hashlib.sha256(raw_token.encode()).hexdigest()
+    
+    def set_email_verification_token(self):
+        """Store the digest of a new verification token and return the raw token"""
+        raw_token = secrets.token_urlsafe(32)
+        self.email_verification_token = self.hash_token(raw_token)
+        return raw_token
+    
+    def check_email_verification_token(self, raw_token):
+        if not self.email_verification_token or not raw_token:
+            return False
+        return constant_time_compare(self.email_verification_token, self.hash_token(raw_token))
+    
+    def set_password_reset_token(self, valid_for=timedelta(hours=1)):
+        """Store the digest of a new reset token with its expiry and return the raw token"""
+        raw_token = secrets.token_urlsafe(32)
+        self.password_reset_token = self.hash_token(raw_token)
+        self.password_reset_expires = timezone.now() + valid_for
+        return raw_token
+    
+    @classmethod
+    def for_password_reset_token(cls, raw_token):
+        """Return the active portal user holding this unexpired reset token, or None"""
+        if not raw_token:
+            return None
+        return cls.objects.filter(
+            password_reset_token=cls.hash_token(raw_token),
+            password_reset_expires__gt=timezone.now(),
+            is_active=True
+        ).first()
+    
+    @cached_property
     def full_name(self):
         if self.employee:
             return f"{self.employee.first_name} {self.employee.last_name}"
@@ -0,0 +1,56 @@
+"""
+Cached reads of the carrier and plan reference data shown on the dashboards
+and used by exports. These tables change rarely; entries are dropped by the
+receivers in broker_console.signals, and callers that bulk_create carriers or
+plans call invalidate_reference_data() themselves.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+from .models import Carrier, Plan
+
+# Seconds reference data stays cached when nothing invalidates it first
+REFERENCE_DATA_CACHE_TIMEOUT = 300
+
+CARRIERS_CACHE_KEY = 'broker_console:carriers'
+PLAN_COUNTS_CACHE_KEY = 'broker_console:active_plan_counts'
+
+
+def carriers():
+    """All carriers, ordered by name."""
+    result = cache.get(CARRIERS_CACHE_KEY)
+    if result is None:
+        result = list(Carrier.objects.all())
+        cache.set(CARRIERS_CACHE_KEY, result, REFERENCE_DATA_CACHE_TIMEOUT)
+    return result
+
+
+def active_carriers():
+    """Active carriers, ordered by name."""
+    return [carrier for carrier in carriers() if carrier.is_active]
+
+
+def carrier_by_name(name):
+    """Return the carrier with this name, raising Carrier.DoesNotExist if there is none."""
+    for carrier in carriers():
+        if carrier.name == name:
+            return carrier
+    raise Carrier.DoesNotExist(f'Carrier matching name {name!r} does not exist.')
+
+
+def active_plan_counts():
+    """Counts of active plans: 'total' and one entry per medical/dental/vision plan type."""
+    counts = cache.get(PLAN_COUNTS_CACHE_KEY)
+    if counts is None:
+        counts = Plan.objects.filter(is_active=True).aggregate(
+            total=Count('id'),
+            medical=Count('id', filter=Q(plan_type='medical')),
+            dental=Count('id', filter=Q(plan_type='dental')),
+            vision=Count('id', filter=Q(plan_type='vision')),
+        )
+        cache.set(PLAN_COUNTS_CACHE_KEY, counts, REFERENCE_DATA_CACHE_TIMEOUT)
+    return counts
+
+
+def invalidate_reference_data():
+    """Drop the cached carriers and plan counts."""
+    cache.delete_many([CARRIERS_CACHE_KEY, PLAN_COUNTS_CACHE_KEY])
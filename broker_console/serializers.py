@@ -1,3 +1,7 @@
+import copy
+from django.db.models import CharField, Prefetch, Value
+from django.db.models.functions import Concat
+from django.utils.functional import cached_property
 from rest_framework import serializers
 from .models import (
     Broker, BrokerUser, Employer, Carrier, Plan, 
@@ -6,38 +10,84 @@ from .models import (
     PlanEnrollment, EnrollmentEvent, EmployeeFormSubmission, EmployeePortalUser
 )
 
-class BrokerSerializer(serializers.ModelSerializer):
+class EagerLoadingSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer whose Meta.select_related and Meta.prefetch_related name
+    the relations its fields read, including those of nested serializers.
+    Viewsets pass their queryset through setup_eager_loading() so the joins
+    stay next to the fields that need them. Serializers that render only a
+    few columns of a wide model can also list them in Meta.only.
+    """
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        select_related = getattr(cls.Meta, 'select_related', ())
+        prefetch_related = getattr(cls.Meta, 'prefetch_related', ())
+        only = getattr(cls.Meta, 'only', ())
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if only:
+            queryset = queryset.only(*only)
+        return queryset
+
+    def get_fields(self):
+        # Building fields from the model's meta is the same for every instance,
+        # since no field here depends on the context. Build them once per class
+        # and hand each instance its own copy, as binding a field mutates it.
+        cls = type(self)
+        fields = cls.__dict__.get('_fields_cache')
+        if fields is None:
+            fields = super().get_fields()
+            cls._fields_cache = fields
+        return copy.deepcopy(fields)
+
+    @cached_property
+    def _readable_fields(self):
+        # DRF filters out write-only fields on every to_representation() call;
+        # a list serializer reuses one child instance for all of its rows
+        return tuple(field for field in self.fields.values() if not field.write_only)
+
+class BrokerSerializer(EagerLoadingSerializer):
     class Meta:
         model = Broker
-        fields = '__all__'
+        fields = ['id', 'created_at', 'updated_at', 'agency_name', 'license_number', 'phone',
+                 'email', 'address']
 
-class CarrierSerializer(serializers.ModelSerializer):
+class CarrierSerializer(EagerLoadingSerializer):
     class Meta:
         model = Carrier
-        fields = '__all__'
+        fields = ['id', 'created_at', 'updated_at', 'name', 'code', 'is_active']
 
-class PlanSerializer(serializers.ModelSerializer):
+class PlanSerializer(EagerLoadingSerializer):
     carrier_name = serializers.CharField(source='carrier.name', read_only=True)
     
     class Meta:
         model = Plan
-        fields = '__all__'
+        select_related = ['carrier']
+        fields = ['id', 'carrier_name', 'created_at', 'updated_at', 'name', 'plan_type',
+                 'external_code', 'is_active', 'carrier']
 
-class PlanPremiumSerializer(serializers.ModelSerializer):
+class PlanPremiumSerializer(EagerLoadingSerializer):
     plan_name = serializers.CharField(source='plan.name', read_only=True)
     
     class Meta:
         model = PlanPremium
-        fields = '__all__'
+        select_related = ['plan']
+        fields = ['id', 'plan_name', 'created_at', 'updated_at', 'coverage_tier',
+                 'monthly_premium', 'effective_date', 'end_date', 'plan']
 
-class EmployerSerializer(serializers.ModelSerializer):
+class EmployerSerializer(EagerLoadingSerializer):
     broker_name = serializers.CharField(source='broker.agency_name', read_only=True)
     
     class Meta:
         model = Employer
-        fields = '__all__'
+        select_related = ['broker']
+        fields = ['id', 'broker_name', 'created_at', 'updated_at', 'name', 'ein', 'size',
+                 'effective_date', 'renewal_date', 'status', 'contact_name', 'contact_email',
+                 'contact_phone', 'address', 'broker']
 
-class EmployerOfferingSerializer(serializers.ModelSerializer):
+class EmployerOfferingSerializer(EagerLoadingSerializer):
     employer_name = serializers.CharField(source='employer.name', read_only=True)
     plan_name = serializers.CharField(source='plan.name', read_only=True)
     plan_type = serializers.CharField(source='plan.plan_type', read_only=True)
@@ -45,69 +95,106 @@ class EmployerOfferingSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = EmployerOffering
-        fields = '__all__'
+        select_related = ['employer', 'plan__carrier']
+        fields = ['id', 'employer_name', 'plan_name', 'plan_type', 'carrier_name',
+                 'created_at', 'updated_at', 'is_active', 'contribution_mode',
+                 'contribution_value', 'employer', 'plan']
 
-class CarrierCsvTemplateSerializer(serializers.ModelSerializer):
+class CarrierCsvTemplateSerializer(EagerLoadingSerializer):
     carrier_name = serializers.CharField(source='carrier.name', read_only=True)
     
     class Meta:
         model = CarrierCsvTemplate
-        fields = '__all__'
+        select_related = ['carrier']
+        fields = ['id', 'carrier_name', 'created_at', 'updated_at', 'name', 'coverage_type',
+                 'template_fields', 'is_active', 'carrier']
 
-class ExportJobSerializer(serializers.ModelSerializer):
+class ExportJobSerializer(EagerLoadingSerializer):
     employer_name = serializers.CharField(source='employer.name', read_only=True)
     carrier_name = serializers.CharField(source='carrier.name', read_only=True)
     
     class Meta:
         model = ExportJob
-        fields = '__all__'
+        select_related = ['employer', 'carrier']
+        fields = ['id', 'employer_name', 'carrier_name', 'created_at', 'updated_at',
+                 'coverage_type', 'status', 'file_name', 'error_details', 'employer',
+                 'carrier', 'created_by']
 
 # Detailed serializers for specific endpoints
-class EmployerDetailSerializer(serializers.ModelSerializer):
+class EmployerDetailSerializer(EagerLoadingSerializer):
     broker = BrokerSerializer(read_only=True)
     offerings = EmployerOfferingSerializer(many=True, read_only=True)
     
     class Meta:
         model = Employer
-        fields = '__all__'
+        select_related = ['broker']
+        prefetch_related = [
+            Prefetch('offerings', queryset=EmployerOffering.objects.select_related('plan__carrier'))
+        ]
+        fields = ['id', 'broker', 'offerings', 'created_at', 'updated_at', 'name', 'ein',
+                 'size', 'effective_date', 'renewal_date', 'status', 'contact_name',
+                 'contact_email', 'contact_phone', 'address']
 
-class PlanDetailSerializer(serializers.ModelSerializer):
+class PlanDetailSerializer(EagerLoadingSerializer):
     carrier = CarrierSerializer(read_only=True)
     premiums = PlanPremiumSerializer(many=True, read_only=True)
     
     class Meta:
         model = Plan
-        fields = '__all__'
+        select_related = ['carrier']
+        prefetch_related = ['premiums']
+        fields = ['id', 'carrier', 'premiums', 'created_at', 'updated_at', 'name', 'plan_type',
+                 'external_code', 'is_active']
 
-class DependentSerializer(serializers.ModelSerializer):
+class DependentSerializer(EagerLoadingSerializer):
     class Meta:
         model = Dependent
-        fields = '__all__'
+        fields = ['id', 'created_at', 'updated_at', 'first_name', 'last_name',
+                 'middle_initial', 'ssn', 'date_of_birth', 'gender', 'relationship',
+                 'medical_coverage', 'dental_coverage', 'vision_coverage', 'employee']
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(EagerLoadingSerializer):
     employer_name = serializers.CharField(source='employer.name', read_only=True)
     dependents = DependentSerializer(many=True, read_only=True)
     
     class Meta:
         model = Employee
-        fields = '__all__'
+        select_related = ['employer']
+        prefetch_related = ['dependents']
+        fields = ['id', 'employer_name', 'dependents', 'created_at', 'updated_at',
+                 'employee_id', 'first_name', 'last_name', 'middle_initial', 'ssn',
+                 'date_of_birth', 'gender', 'marital_status', 'email', 'phone',
+                 'address_line1', 'address_line2', 'city', 'state', 'zip_code', 'hire_date',
+                 'job_title', 'department', 'salary', 'hours_per_week', 'employment_status',
+                 'medical_coverage_tier', 'dental_coverage_tier', 'vision_coverage_tier',
+                 'employer']
 
-class EmployeeDetailSerializer(serializers.ModelSerializer):
+class EmployeeDetailSerializer(EagerLoadingSerializer):
     employer = EmployerSerializer(read_only=True)
     dependents = DependentSerializer(many=True, read_only=True)
     
     class Meta:
         model = Employee
-        fields = '__all__'
+        select_related = ['employer__broker']
+        prefetch_related = ['dependents']
+        fields = ['id', 'employer', 'dependents', 'created_at', 'updated_at', 'employee_id',
+                 'first_name', 'last_name', 'middle_initial', 'ssn', 'date_of_birth',
+                 'gender', 'marital_status', 'email', 'phone', 'address_line1',
+                 'address_line2', 'city', 'state', 'zip_code', 'hire_date', 'job_title',
+                 'department', 'salary', 'hours_per_week', 'employment_status',
+                 'medical_coverage_tier', 'dental_coverage_tier', 'vision_coverage_tier']
 
-class EnrollmentPeriodSerializer(serializers.ModelSerializer):
+class EnrollmentPeriodSerializer(EagerLoadingSerializer):
     employer_name = serializers.CharField(source='employer.name', read_only=True)
     
     class Meta:
         model = EnrollmentPeriod
-        fields = '__all__'
+        select_related = ['employer']
+        fields = ['id', 'employer_name', 'created_at', 'updated_at', 'name', 'period_type',
+                 'status', 'start_date', 'end_date', 'coverage_effective_date', 'allow_waive',
+                 'require_all_plans', 'employer']
 
-class EmployeeEnrollmentSerializer(serializers.ModelSerializer):
+class EmployeeEnrollmentSerializer(EagerLoadingSerializer):
     employee_name = serializers.CharField(source='employee.first_name', read_only=True)
     employee_last_name = serializers.CharField(source='employee.last_name', read_only=True)
     employee_id = serializers.CharField(source='employee.employee_id', read_only=True)
@@ -115,9 +202,31 @@ class EmployeeEnrollmentSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = EmployeeEnrollment
-        fields = '__all__'
+        select_related = ['employee', 'enrollment_period']
+        fields = ['id', 'employee_name', 'employee_last_name', 'employee_id',
+                 'enrollment_period_name', 'created_at', 'updated_at', 'status', 'started_at',
+                 'submitted_at', 'approved_at', 'notes', 'waived_coverage', 'waiver_reason',
+                 'employee', 'enrollment_period', 'approved_by']
 
-class PlanEnrollmentSerializer(serializers.ModelSerializer):
+class PlanEnrollmentSerializer(EagerLoadingSerializer):
+    plan_name = serializers.CharField(source='plan.name', read_only=True)
+    plan_type = serializers.CharField(source='plan.plan_type', read_only=True)
+    carrier_name = serializers.CharField(source='plan.carrier.name', read_only=True)
+    employee_name = serializers.CharField(source='employee_enrollment.employee.first_name', read_only=True)
+    employee_last_name = serializers.CharField(source='employee_enrollment.employee.last_name', read_only=True)
+    
+    class Meta:
+        model = PlanEnrollment
+        select_related = ['plan__carrier', 'employee_enrollment__employee']
+        # covered_dependents renders primary keys only
+        prefetch_related = [Prefetch('covered_dependents', queryset=Dependent.objects.only('id'))]
+        fields = ['id', 'plan_name', 'plan_type', 'carrier_name', 'employee_name',
+                 'employee_last_name', 'created_at', 'updated_at', 'status', 'coverage_tier',
+                 'monthly_premium', 'employee_contribution', 'employer_contribution',
+                 'effective_date', 'termination_date', 'employee_enrollment', 'plan',
+                 'covered_dependents']
+
+class PlanEnrollmentDetailSerializer(EagerLoadingSerializer):
     plan_name = serializers.CharField(source='plan.name', read_only=True)
     plan_type = serializers.CharField(source='plan.plan_type', read_only=True)
     carrier_name = serializers.CharField(source='plan.carrier.name', read_only=True)
@@ -127,9 +236,15 @@ class PlanEnrollmentSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = PlanEnrollment
-        fields = '__all__'
+        select_related = ['plan__carrier', 'employee_enrollment__employee']
+        prefetch_related = ['covered_dependents']
+        fields = ['id', 'plan_name', 'plan_type', 'carrier_name', 'employee_name',
+                 'employee_last_name', 'covered_dependents_details', 'created_at',
+                 'updated_at', 'status', 'coverage_tier', 'monthly_premium',
+                 'employee_contribution', 'employer_contribution', 'effective_date',
+                 'termination_date', 'employee_enrollment', 'plan', 'covered_dependents']
 
-class EnrollmentEventSerializer(serializers.ModelSerializer):
+class EnrollmentEventSerializer(EagerLoadingSerializer):
     employee_name = serializers.CharField(source='employee.first_name', read_only=True)
     employee_last_name = serializers.CharField(source='employee.last_name', read_only=True)
     processed_by_name = serializers.CharField(source='processed_by.email', read_only=True)
@@ -137,61 +252,102 @@ class EnrollmentEventSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = EnrollmentEvent
-        fields = '__all__'
+        select_related = ['employee', 'processed_by', 'plan_enrollment__plan']
+        fields = ['id', 'employee_name', 'employee_last_name', 'processed_by_name',
+                 'plan_name', 'created_at', 'updated_at', 'event_type', 'effective_date',
+                 'previous_coverage_tier', 'new_coverage_tier', 'reason', 'processed_at',
+                 'employee', 'plan_enrollment', 'processed_by']
 
-class EnrollmentPeriodDetailSerializer(serializers.ModelSerializer):
+class EnrollmentPeriodDetailSerializer(EagerLoadingSerializer):
     employer = EmployerSerializer(read_only=True)
     employee_enrollments = EmployeeEnrollmentSerializer(many=True, read_only=True)
     
     class Meta:
         model = EnrollmentPeriod
-        fields = '__all__'
+        select_related = ['employer__broker']
+        prefetch_related = ['employee_enrollments']
+        fields = ['id', 'employer', 'employee_enrollments', 'created_at', 'updated_at', 'name',
+                 'period_type', 'status', 'start_date', 'end_date', 'coverage_effective_date',
+                 'allow_waive', 'require_all_plans']
 
-class EmployeeEnrollmentDetailSerializer(serializers.ModelSerializer):
+class EmployeeEnrollmentDetailSerializer(EagerLoadingSerializer):
     employee = EmployeeSerializer(read_only=True)
     enrollment_period = EnrollmentPeriodSerializer(read_only=True)
-    plan_enrollments = PlanEnrollmentSerializer(many=True, read_only=True)
+    plan_enrollments = PlanEnrollmentDetailSerializer(many=True, read_only=True)
     
     class Meta:
         model = EmployeeEnrollment
-        fields = '__all__'
+        select_related = ['employee__employer', 'enrollment_period__employer']
+        prefetch_related = ['employee__dependents', 'plan_enrollments__covered_dependents']
+        fields = ['id', 'employee', 'enrollment_period', 'plan_enrollments', 'created_at',
+                 'updated_at', 'status', 'started_at', 'submitted_at', 'approved_at', 'notes',
+                 'waived_coverage', 'waiver_reason', 'approved_by']
 
-class EmployeeEnrollmentSummarySerializer(serializers.ModelSerializer):
-    employee_name = serializers.SerializerMethodField()
+class EmployeeEnrollmentSummarySerializer(EagerLoadingSerializer):
+    employee_name = serializers.CharField(source='employee_full_name', read_only=True)
     plan_enrollments_count = serializers.SerializerMethodField()
     total_premium = serializers.SerializerMethodField()
     enrollment_period_name = serializers.CharField(source='enrollment_period.name', read_only=True)
     
     class Meta:
         model = EmployeeEnrollment
+        select_related = ['employee', 'enrollment_period']
         fields = ['id', 'employee_name', 'status', 'enrollment_period_name', 
                  'plan_enrollments_count', 'total_premium', 'submitted_at', 'waived_coverage']
     
-    def get_employee_name(self, obj):
-        return f"{obj.employee.first_name} {obj.employee.last_name}"
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return super().setup_eager_loading(queryset).with_enrolled_totals().annotate(
+            employee_full_name=Concat(
+                'employee__first_name', Value(' '), 'employee__last_name', output_field=CharField()
+            )
+        )
     
+    # Both read annotations added by setup_eager_loading()
     def get_plan_enrollments_count(self, obj):
-        return obj.plan_enrollments.filter(status='enrolled').count()
+        return obj.enrolled_plan_count
     
     def get_total_premium(self, obj):
-        return sum(pe.employee_contribution for pe in obj.plan_enrollments.filter(status='enrolled'))
+        return obj.enrolled_contribution_total or 0
 
-class EmployeeFormSubmissionSerializer(serializers.ModelSerializer):
+class EmployeeFormSubmissionSerializer(EagerLoadingSerializer):
     employer_name = serializers.CharField(source='employer.name', read_only=True)
     reviewed_by_name = serializers.CharField(source='reviewed_by.email', read_only=True)
     
     class Meta:
         model = EmployeeFormSubmission
-        fields = '__all__'
+        select_related = ['employer', 'reviewed_by']
+        fields = ['id', 'employer_name', 'reviewed_by_name', 'created_at', 'updated_at',
+                 'first_name', 'last_name', 'email', 'phone', 'date_of_birth', 'ssn',
+                 'address_line1', 'address_line2', 'city', 'state', 'zip_code', 'hire_date',
+                 'job_title', 'department', 'salary', 'hours_per_week',
+                 'emergency_contact_name', 'emergency_contact_phone',
+                 'emergency_contact_relationship', 'status', 'reviewed_at', 'notes',
+                 'employer', 'reviewed_by', 'created_employee']
 
-class EmployeeFormSubmissionListSerializer(serializers.ModelSerializer):
+class EmployeeFormSubmissionListSerializer(EagerLoadingSerializer):
     employer_name = serializers.CharField(source='employer.name', read_only=True)
     
     class Meta:
         model = EmployeeFormSubmission
+        select_related = ['employer']
+        only = ['id', 'first_name', 'last_name', 'email', 'status', 'created_at', 'employer__name']
         fields = ['id', 'first_name', 'last_name', 'email', 'status', 'created_at', 'employer_name']
 
-class EmployeePortalUserSerializer(serializers.ModelSerializer):
+class EmployeePortalUserSerializer(EagerLoadingSerializer):
+    full_name = serializers.ReadOnlyField()
+    status = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = EmployeePortalUser
+        select_related = ['employee', 'form_submission']
+        fields = ['id', 'email', 'full_name', 'status', 'is_active', 'last_login',
+                 'email_verified', 'created_at']
+        extra_kwargs = {
+            'password_hash': {'write_only': True},
+        }
+
+class EmployeePortalUserDetailSerializer(EagerLoadingSerializer):
     full_name = serializers.ReadOnlyField()
     status = serializers.ReadOnlyField()
     employee_data = EmployeeSerializer(source='employee', read_only=True)
@@ -199,6 +355,10 @@ class EmployeePortalUserSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = EmployeePortalUser
+        select_related = [
+            'employee__employer', 'form_submission__employer', 'form_submission__reviewed_by'
+        ]
+        prefetch_related = ['employee__dependents']
         fields = ['id', 'email', 'full_name', 'status', 'is_active', 'last_login', 
                  'email_verified', 'employee_data', 'form_submission_data', 'created_at']
         extra_kwargs = {
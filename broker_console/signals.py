@@ -0,0 +1,49 @@
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .models import Carrier, Employee, EmployeeFormSubmission, EmployeePortalUser, Plan, PlanEnrollment, PlanPremium
+from .reference import invalidate_reference_data
+
+
+@receiver(pre_save, sender=PlanEnrollment)
+def fill_monthly_premium(sender, instance, **kwargs):
+    """
+    Store the plan's premium for the coverage tier on the enrollment when none
+    was given, so reads never have to search the PlanPremium history.
+    """
+    if instance.monthly_premium is not None:
+        return
+    premium = PlanPremium.objects.filter(
+        Q(end_date__isnull=True) | Q(end_date__gte=instance.effective_date),
+        plan_id=instance.plan_id,
+        coverage_tier=instance.coverage_tier,
+        effective_date__lte=instance.effective_date,
+    ).order_by('-effective_date').values_list('monthly_premium', flat=True).first()
+    instance.monthly_premium = premium if premium is not None else 0
+
+
+@receiver(post_save, sender=Employee)
+def sync_portal_sort_name_from_employee(sender, instance, created, **kwargs):
+    """Keep the linked portal user's sort_name in step with the employee's name."""
+    if created:
+        return
+    EmployeePortalUser.objects.filter(employee=instance).update(
+        sort_name=EmployeePortalUser.sort_name_for(instance)
+    )
+
+
+@receiver(post_save, sender=EmployeeFormSubmission)
+def sync_portal_sort_name_from_submission(sender, instance, created, **kwargs):
+    """Keep sort_name in step for portal users not yet linked to an employee."""
+    if created:
+        return
+    EmployeePortalUser.objects.filter(form_submission=instance, employee__isnull=True).update(
+        sort_name=EmployeePortalUser.sort_name_for(instance)
+    )
+
+
+@receiver([post_save, post_delete], sender=Carrier)
+@receiver([post_save, post_delete], sender=Plan)
+def invalidate_reference_data_on_change(sender, **kwargs):
+    """Drop the cached carriers and plan counts when either table changes."""
+    invalidate_reference_data()
@@ -1,3 +1,362 @@
+import uuid
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .models import (
+    Broker, Carrier, Plan, PlanPremium, Employer, EmployerOffering, ExportJob,
+    Employee, Dependent, EnrollmentPeriod, EmployeeEnrollment, PlanEnrollment,
+    EnrollmentEvent, EmployeeFormSubmission, EmployeePortalUser
+)
+from .reference import active_carriers, active_plan_counts, carrier_by_name
+
+User = get_user_model()
+
+
+class EmployeePortalTokenTestCase(TestCase):
+    """Test the portal's emailed verification and password reset tokens."""
+
+    def register(self, email='portal@test.com', password='PortalPass123!'):
+        """Register a portal user and return the raw token from the verification email."""
+        response = self.client.post(
+            reverse('employeeportaluser-register'),
+            {'email': email, 'password': password},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox[-1].to, [email])
+        return mail.outbox[-1].body.split('token is: ')[1].split()[0]
+
+    def test_emailed_token_verifies_email(self):
+        """Test that the token sent at registration verifies the address once."""
+        raw_token = self.register()
+        portal_user = EmployeePortalUser.objects.get(email='portal@test.com')
+        self.assertNotEqual(portal_user.email_verification_token, raw_token)
+        url = reverse('employeeportaluser-verify-email', args=[portal_user.id])
+
+        response = self.client.post(url, {'token': 'wrong'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(url, {'token': raw_token}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        portal_user.refresh_from_db()
+        self.assertTrue(portal_user.email_verified)
+
+        response = self.client.post(url, {'token': raw_token}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_password_reset_with_emailed_token(self):
+        """Test that the reset token sets a new password and can only be used once."""
+        self.register()
+        response = self.client.post(
+            reverse('employeeportaluser-request-password-reset'),
+            {'email': 'portal@test.com'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        raw_token = mail.outbox[-1].body.split('token is: ')[1].split()[0]
+
+        url = reverse('employeeportaluser-reset-password')
+        response = self.client.post(url, {'token': raw_token, 'new_password': 'short'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(url, {'token': raw_token, 'new_password': 'NewPortalPass456!'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(EmployeePortalUser.objects.get(email='portal@test.com').check_password('NewPortalPass456!'))
+
+        response = self.client.post(url, {'token': raw_token, 'new_password': 'AnotherPass789!'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_password_reset_for_unknown_email_sends_nothing(self):
+        """Test that unknown emails get the same response and no email."""
+        response = self.client.post(
+            reverse('employeeportaluser-request-password-reset'),
+            {'email': 'nobody@test.com'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+
+
+class ReferenceDataCacheTestCase(TestCase):
+    """Test the cached carrier and plan reference data used by the dashboards."""
+
+    def setUp(self):
+        """Set up one carrier with an active medical plan."""
+        cache.clear()
+        self.carrier = Carrier.objects.create(name='Aetna', code='AETNA')
+        Plan.objects.create(carrier=self.carrier, name='PPO', plan_type='medical', external_code='PPO')
+
+    def test_plan_counts_are_cached(self):
+        """Test that a warm lookup does not hit the database."""
+        self.assertEqual(active_plan_counts(), {'total': 1, 'medical': 1, 'dental': 0, 'vision': 0})
+        with self.assertNumQueries(0):
+            active_plan_counts()
+
+    def test_plan_change_invalidates_cache(self):
+        """Test that saving a plan refreshes the cached counts."""
+        active_plan_counts()
+        Plan.objects.create(carrier=self.carrier, name='Dental', plan_type='dental', external_code='DEN')
+        self.assertEqual(active_plan_counts()['dental'], 1)
+
+    def test_carrier_change_invalidates_cache(self):
+        """Test that deactivating a carrier drops it from the cached active list."""
+        self.assertEqual(active_carriers(), [self.carrier])
+        self.carrier.is_active = False
+        self.carrier.save()
+        self.assertEqual(active_carriers(), [])
+        self.assertEqual(carrier_by_name('Aetna'), self.carrier)
+
+
+class BrokerConsoleQueryCountTestCase(TestCase):
+    """Test that the broker console list endpoints don't query once per row."""
+
+    LIST_ROUTES = [
+        'plan-list', 'employer-list', 'employeroffering-list', 'exportjob-list',
+        'employee-list', 'dependent-list', 'enrollmentperiod-list',
+        'employeeenrollment-list', 'planenrollment-list', 'enrollmentevent-list',
+        'employeeformsubmission-list', 'employeeportaluser-list',
+    ]
+
+    def setUp(self):
+        """Set up an API client logged in as a staff user."""
+        self.user = User.objects.create(email='staff@test.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def add_employer(self, n):
+        """Create an employer with one row for every broker console model."""
+        broker = Broker.objects.create(agency_name=f'Broker {n}', license_number=f'LIC-{n}', email=f'broker{n}@test.com')
+        carrier = Carrier.objects.create(name=f'Carrier {n}', code=f'C{n}')
+        plan = Plan.objects.create(carrier=carrier, name=f'Plan {n}', plan_type='medical', external_code=f'P{n}')
+        PlanPremium.objects.create(plan=plan, coverage_tier='family', monthly_premium=500, effective_date=date(2024, 1, 1))
+        employer = Employer.objects.create(
+            broker=broker, name=f'Employer {n}', ein=f'00-000000{n}', size=10, status='active',
+            effective_date=date(2024, 1, 1), renewal_date=date(2024, 12, 31),
+            contact_name='HR', contact_email=f'hr{n}@test.com', contact_phone='555-0000', address='1 Main St'
+        )
+        EmployerOffering.objects.create(employer=employer, plan=plan, contribution_mode='percent', contribution_value=80)
+        ExportJob.objects.create(employer=employer, carrier=carrier, coverage_type='medical', created_by=self.user)
+        employee = Employee.objects.create(
+            employer=employer, employee_id=f'EMP{n}', first_name='Pat', last_name=f'Lee{n}',
+            email=f'pat{n}@test.com', date_of_birth=date(1990, 1, 1), gender='F', hire_date=date(2020, 1, 1),
+            salary=50000, address_line1='1 Main St', city='Boston', state='MA', zip_code='02101'
+        )
+        dependent = Dependent.objects.create(
+            employee=employee, first_name='Sam', last_name=f'Lee{n}', date_of_birth=date(2015, 1, 1),
+            gender='M', relationship='child'
+        )
+        period = EnrollmentPeriod.objects.create(
+            employer=employer, name=f'Open Enrollment {n}', period_type='open_enrollment', status='active',
+            start_date=date(2024, 1, 1), end_date=date(2024, 2, 1), coverage_effective_date=date(2024, 3, 1)
+        )
+        enrollment = EmployeeEnrollment.objects.create(employee=employee, enrollment_period=period, status='submitted')
+        plan_enrollment = PlanEnrollment.objects.create(
+            employee_enrollment=enrollment, plan=plan, coverage_tier='family', status='enrolled',
+            employee_contribution=100, employer_contribution=400, effective_date=date(2024, 3, 1)
+        )
+        plan_enrollment.covered_dependents.add(dependent)
+        EnrollmentEvent.objects.create(
+            employee=employee, event_type='enrollment', effective_date=date(2024, 3, 1),
+            plan_enrollment=plan_enrollment, processed_by=self.user
+        )
+        submission = EmployeeFormSubmission.objects.create(
+            employer=employer, first_name='Pat', last_name=f'Lee{n}', email=f'pat{n}@test.com',
+            phone='555-0000', date_of_birth=date(1990, 1, 1), address_line1='1 Main St', city='Boston',
+            state='MA', zip_code='02101', hire_date=date(2020, 1, 1), job_title='Analyst',
+            department='Finance', salary=50000, hours_per_week=40, reviewed_by=self.user
+        )
+        portal_user = EmployeePortalUser(email=f'pat{n}@test.com', employee=employee, form_submission=submission)
+        portal_user.set_password('PortalPass123!')
+        portal_user.save()
+
+    def count_queries(self, route):
+        """Return the number of queries a GET of the named list route runs."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(route))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_list_queries_do_not_grow_with_rows(self):
+        """Test that each serializer's declared joins cover the relations it renders."""
+        self.add_employer(1)
+        counts = {route: self.count_queries(route) for route in self.LIST_ROUTES}
+        self.add_employer(2)
+        self.add_employer(3)
+        for route in self.LIST_ROUTES:
+            with self.subTest(route=route):
+                self.assertEqual(self.count_queries(route), counts[route])
+
+    def test_plain_managers_allow_projections(self):
+        """Test that plain_objects can defer the fields the default managers join."""
+        self.add_employer(1)
+        self.assertEqual(list(Employee.plain_objects.only('employee_id').values_list('employee_id', flat=True)), ['EMP1'])
+        self.assertEqual(Employee.plain_objects.defer('employer').get().last_name, 'Lee1')
+        self.assertEqual(EmployeeEnrollment.plain_objects.only('status').get().status, 'submitted')
+        self.assertEqual(PlanEnrollment.plain_objects.only('coverage_tier').get().coverage_tier, 'family')
+        self.assertEqual(EnrollmentEvent.plain_objects.only('event_type').get().event_type, 'enrollment')
+
+
+class BulkImportEmployeesTestCase(TestCase):
+    """Test the employer census CSV import."""
+
+    HEADER = 'employee_id,first_name,last_name,email,date_of_birth,gender,hire_date,salary,state\n'
+
+    def setUp(self):
+        """Set up an employer and an API client logged in as a staff user."""
+        user = User.objects.create(email='importer@test.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+        broker = Broker.objects.create(agency_name='Test Agency')
+        self.employer = Employer.objects.create(
+            broker=broker, name='Acme', ein='12-3456789', size=10, effective_date=date(2025, 1, 1)
+        )
+
+    def upload(self, rows):
+        """POST a CSV of the given data rows and return the response JSON."""
+        response = self.client.post(
+            reverse('employer-bulk-import-employees', args=[self.employer.id]),
+            {'file': SimpleUploadedFile('census.csv', (self.HEADER + rows).encode())},
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def stored(self):
+        """Return the employer's employees as comparable tuples."""
+        return list(
+            Employee.objects.filter(employer=self.employer).order_by('employee_id').values_list(
+                'employee_id', 'first_name', 'date_of_birth', 'gender', 'salary', 'hours_per_week', 'state'
+            )
+        )
+
+    def test_counts_created_then_updated(self):
+        """Test that a re-import updates the same rows instead of creating new ones."""
+        rows = (
+            '007,Ann,Lee,ann@acme.com,1990-01-05,f,2020-01-01,50000,Massachusetts\n'
+            '008,Bob,Ray,bob@acme.com,01/02/1985,M,2021-03-04,,NY\n'
+        )
+        result = self.upload(rows)
+        self.assertEqual((result['employees_created'], result['employees_updated'], result['errors']), (2, 0, []))
+        first_import = self.stored()
+        self.assertEqual(first_import, [
+            ('007', 'Ann', date(1990, 1, 5), 'F', 50000, 40, 'Ma'),
+            ('008', 'Bob', date(1985, 1, 2), 'M', 0, 40, 'NY'),
+        ])
+
+        result = self.upload(rows)
+        self.assertEqual((result['employees_created'], result['employees_updated'], result['errors']), (0, 2, []))
+        self.assertEqual(self.stored(), first_import)
+
+    def test_duplicate_ids_keep_the_last_row(self):
+        """Test that a repeated employee_id counts as an update and the later row wins."""
+        result = self.upload(
+            '100,Ann,Lee,ann@acme.com,1990-01-05,F,2020-01-01,50000,MA\n'
+            '100,Anne,Lee,anne@acme.com,1990-01-05,F,2020-01-01,60000,MA\n'
+        )
+        self.assertEqual((result['employees_created'], result['employees_updated']), (1, 1))
+        self.assertEqual(self.stored(), [('100', 'Anne', date(1990, 1, 5), 'F', 60000, 40, 'MA')])
+
+    def test_invalid_values_are_reported_per_row(self):
+        """Test that bad dates, salaries and constraint violations skip only their rows."""
+        result = self.upload(
+            '200,Ann,Lee,ann@acme.com,1990-01-05,F,2020-01-01,50000,MA\n'
+            '201,Cy,Zed,cy@acme.com,garbage,M,2021-03-04,100,MA\n'
+            '202,Di,Ng,di@acme.com,1980-01-01,F,2021-03-04,abc,MA\n'
+            '203,Ed,Po,ed@acme.com,1980-01-01,X,2021-03-04,100,MA\n'
+        )
+        self.assertEqual(result['employees_created'], 1)
+        self.assertEqual(
+            [(error['row'], error['employee_id']) for error in result['errors']],
+            [(3, '201'), (4, '202'), (5, '203')]
+        )
+        self.assertEqual(result['errors'][0]['error'], 'Invalid date_of_birth: garbage')
+        self.assertEqual(result['errors'][1]['error'], 'Invalid salary: abc')
+        self.assertEqual([row[0] for row in self.stored()], ['200'])
+
+    def test_blank_required_values_are_reported_per_row(self):
+        """Test that rows with a blank employee_id or name are rejected instead of merged."""
+        result = self.upload(
+            ',Ann,Lee,ann@acme.com,1990-01-05,F,2020-01-01,50000,MA\n'
+            ' ,Bob,Ray,bob@acme.com,1985-01-02,M,2021-03-04,100,MA\n'
+            '300,,Ng,di@acme.com,1980-01-01,F,2021-03-04,100,MA\n'
+            '301,Ed,Po,ed@acme.com,1980-01-01,M,2021-03-04,100,MA\n'
+        )
+        self.assertEqual((result['employees_created'], result['employees_updated']), (1, 0))
+        self.assertEqual(
+            [(error['row'], error['employee_id'], error['error']) for error in result['errors']],
+            [(2, '', 'Missing employee_id'), (3, '', 'Missing employee_id'), (4, '300', 'Missing first_name')]
+        )
+        self.assertEqual([row[0] for row in self.stored()], ['301'])
+
+
+class EmployeeEnrollmentTransitionTestCase(TestCase):
+    """Test the employee enrollment start/submit/approve actions."""
+
+    def setUp(self):
+        """Set up a not-started enrollment and an API client logged in as a staff user."""
+        self.user = User.objects.create(email='approver@test.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        broker = Broker.objects.create(agency_name='Test Agency')
+        employer = Employer.objects.create(
+            broker=broker, name='Acme', ein='12-3456789', size=10, effective_date=date(2025, 1, 1)
+        )
+        employee = Employee.objects.create(
+            employer=employer, employee_id='E1', first_name='Pat', last_name='Lee', email='pat@acme.com',
+            date_of_birth=date(1990, 1, 1), gender='F', hire_date=date(2020, 1, 1), salary=50000
+        )
+        period = EnrollmentPeriod.objects.create(
+            employer=employer, name='Open Enrollment', period_type='open_enrollment',
+            start_date=date(2025, 1, 1), end_date=date(2025, 2, 1), coverage_effective_date=date(2025, 3, 1)
+        )
+        self.enrollment = EmployeeEnrollment.objects.create(employee=employee, enrollment_period=period)
+
+    def post(self, action):
+        """POST the named enrollment action and return the response."""
+        return self.client.post(reverse(f'employeeenrollment-{action}', args=[self.enrollment.id]))
+
+    def test_actions_move_through_the_workflow(self):
+        """Test that each action sets the status, its timestamp and the approver."""
+        response = self.post('start-enrollment')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'in_progress')
+        self.assertIsNotNone(response.json()['started_at'])
+
+        response = self.post('submit-enrollment')
+        self.assertEqual(response.json()['status'], 'submitted')
+        self.assertEqual(EnrollmentEvent.objects.filter(employee=self.enrollment.employee).count(), 1)
+
+        response = self.post('approve-enrollment')
+        self.assertEqual(response.json()['status'], 'approved')
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.approved_by, self.user)
+        self.assertIsNotNone(self.enrollment.approved_at)
+
+    def test_repeated_transition_is_rejected(self):
+        """Test that a transition from the wrong status returns 400 and changes nothing."""
+        self.assertEqual(self.post('approve-enrollment').status_code, 400)
+        self.assertEqual(self.post('start-enrollment').status_code, 200)
+        response = self.post('start-enrollment')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Enrollment already started'})
+        self.post('submit-enrollment')
+        self.assertEqual(self.post('submit-enrollment').status_code, 400)
+        self.assertEqual(EnrollmentEvent.objects.count(), 1)
+
+    def test_unknown_enrollment_is_not_found(self):
+        """Test that an unknown enrollment returns 404."""
+        response = self.client.post(reverse('employeeenrollment-start-enrollment', args=[uuid.uuid4()]))
+        self.assertEqual(response.status_code, 404)
 
-# Create your tests here.
+    def test_malformed_enrollment_id_is_not_found(self):
+        """Test that a pk that is not a UUID returns 404 rather than an error."""
+        response = self.client.post(reverse('employeeenrollment-start-enrollment', args=['not-a-uuid']))
+        self.assertEqual(response.status_code, 404)
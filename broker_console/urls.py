@@ -1,5 +1,5 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from .views import (
     BrokerViewSet, CarrierViewSet, PlanViewSet, 
     EmployerViewSet, EmployerOfferingViewSet, ExportJobViewSet,
@@ -8,7 +8,8 @@ from .views import (
     EmployeeFormSubmissionViewSet, EmployeePortalViewSet
 )
 
-router = DefaultRouter()
+# No browsable API root or format suffix routes; clients call the endpoints directly
+router = SimpleRouter()
 router.register(r'brokers', BrokerViewSet)
 router.register(r'carriers', CarrierViewSet)
 router.register(r'plans', PlanViewSet)
@@ -2,14 +2,19 @@ import os
 import uuid
 import csv
 import io
-from datetime import date, datetime
+import itertools
+from datetime import date
 from django.conf import settings
 from django.core.files.storage import default_storage
+from django.core.mail import send_mail
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 import pandas as pd
 from .models import (
     Broker, Employer, Carrier, Plan, PlanPremium, 
@@ -17,6 +22,7 @@ from .models import (
     Employee, Dependent, EnrollmentPeriod, EmployeeEnrollment,
     PlanEnrollment, EnrollmentEvent, EmployeeFormSubmission, EmployeePortalUser
 )
+from .reference import carrier_by_name
 from .serializers import (
     BrokerSerializer, EmployerSerializer, EmployerDetailSerializer,
     CarrierSerializer, PlanSerializer, PlanDetailSerializer,
@@ -25,21 +31,117 @@ from .serializers import (
     EmployeeSerializer, EmployeeDetailSerializer, DependentSerializer,
     EnrollmentPeriodSerializer, EnrollmentPeriodDetailSerializer,
     EmployeeEnrollmentSerializer, EmployeeEnrollmentDetailSerializer,
-    EmployeeEnrollmentSummarySerializer, PlanEnrollmentSerializer,
+    EmployeeEnrollmentSummarySerializer, PlanEnrollmentSerializer, PlanEnrollmentDetailSerializer,
     EnrollmentEventSerializer, EmployeeFormSubmissionSerializer,
     EmployeeFormSubmissionListSerializer, EmployeePortalUserSerializer,
-    EmployeePortalLoginSerializer, EmployeePortalRegisterSerializer
+    EmployeePortalUserDetailSerializer, EmployeePortalLoginSerializer,
+    EmployeePortalRegisterSerializer
 )
 
-class BrokerViewSet(viewsets.ModelViewSet):
+# Employees written per INSERT ... ON CONFLICT statement by the bulk import
+EMPLOYEE_IMPORT_BATCH_SIZE = 1000
+
+# CSV rows read into memory at a time by the bulk import
+EMPLOYEE_IMPORT_CHUNK_SIZE = 10000
+
+# Largest Excel file the bulk import accepts; xlsx is read whole, so bigger files must come as CSV
+EMPLOYEE_IMPORT_MAX_EXCEL_BYTES = 20 * 1024 * 1024
+
+# Header and sample rows of the bulk import CSV template
+EMPLOYEE_TEMPLATE_HEADER = (
+    'employee_id', 'first_name', 'last_name', 'middle_initial', 'email', 'ssn',
+    'date_of_birth', 'gender', 'marital_status', 'phone', 'address_line1', 'address_line2',
+    'city', 'state', 'zip_code', 'hire_date', 'job_title', 'department', 'salary',
+    'hours_per_week', 'employment_status', 'medical_coverage_tier', 'dental_coverage_tier',
+    'vision_coverage_tier',
+)
+EMPLOYEE_TEMPLATE_ROWS = (
+    ('EMP001', 'John', 'Smith', 'A', 'john.smith@company.com', '123-45-6789',
+     '1985-03-15', 'M', 'married', '555-123-4567', '123 Main St', 'Apt 1',
+     'Boston', 'MA', '02101', '2020-01-15', 'Software Engineer', 'Engineering', 95000,
+     40, 'active', 'family', 'family', 'family'),
+    ('EMP002', 'Jane', 'Doe', 'M', 'jane.doe@company.com', '987-65-4321',
+     '1990-07-22', 'F', 'single', '555-987-6543', '456 Oak Ave', '',
+     'Cambridge', 'MA', '02139', '2021-06-01', 'Product Manager', 'Product', 105000,
+     40, 'active', 'employee_only', 'employee_only', 'employee_only'),
+)
+
+# (header, Employee field) pairs for the employer census CSV
+CENSUS_CSV_COLUMNS = [
+    ('Employee ID', 'employee_id'),
+    ('First Name', 'first_name'),
+    ('Last Name', 'last_name'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Date of Birth', 'date_of_birth'),
+    ('SSN', 'ssn'),
+    ('Address', 'address_line1'),
+    ('City', 'city'),
+    ('State', 'state'),
+    ('Zip', 'zip_code'),
+    ('Hire Date', 'hire_date'),
+    ('Job Title', 'job_title'),
+    ('Department', 'department'),
+    ('Salary', 'salary'),
+    ('Hours per Week', 'hours_per_week'),
+    ('Employment Status', 'employment_status'),
+]
+
+# (header, Employee field) pairs for the Aetna census export, in column order
+AETNA_EMPLOYEE_COLUMNS = [
+    ('Employee ID', 'employee_id'),
+    ('First Name', 'first_name'),
+    ('Last Name', 'last_name'),
+    ('Middle Initial', 'middle_initial'),
+    ('SSN', 'ssn'),
+    ('Date of Birth', 'date_of_birth'),
+    ('Gender', 'gender'),
+    ('Marital Status', 'marital_status'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Address Line 1', 'address_line1'),
+    ('Address Line 2', 'address_line2'),
+    ('City', 'city'),
+    ('State', 'state'),
+    ('ZIP Code', 'zip_code'),
+    ('Hire Date', 'hire_date'),
+    ('Job Title', 'job_title'),
+    ('Department', 'department'),
+    ('Annual Salary', 'salary'),
+    ('Hours Per Week', 'hours_per_week'),
+    ('Employment Status', 'employment_status'),
+]
+
+# (header, Dependent field) pairs for the Aetna export's dependent columns,
+# which follow its Coverage Tier column
+AETNA_DEPENDENT_COLUMNS = [
+    ('Relationship', 'relationship'),
+    ('Dependent First Name', 'first_name'),
+    ('Dependent Last Name', 'last_name'),
+    ('Dependent DOB', 'date_of_birth'),
+    ('Dependent Gender', 'gender'),
+    ('Dependent SSN', 'ssn'),
+]
+
+class Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output"""
+    def write(self, value):
+        return value
+
+class EagerLoadingMixin:
+    """Runs the viewset's queryset through its serializer class's setup_eager_loading()"""
+    def get_queryset(self):
+        return self.get_serializer_class().setup_eager_loading(super().get_queryset())
+
+class BrokerViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Broker.objects.all()
     serializer_class = BrokerSerializer
 
-class CarrierViewSet(viewsets.ModelViewSet):
+class CarrierViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Carrier.objects.all()
     serializer_class = CarrierSerializer
 
-class PlanViewSet(viewsets.ModelViewSet):
+class PlanViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Plan.objects.all()
     serializer_class = PlanSerializer
     
@@ -52,12 +154,12 @@ class PlanViewSet(viewsets.ModelViewSet):
     def by_carrier(self, request):
         carrier_id = request.query_params.get('carrier_id')
         if carrier_id:
-            plans = Plan.objects.filter(carrier_id=carrier_id, is_active=True)
+            plans = self.get_queryset().filter(carrier_id=carrier_id, is_active=True)
             serializer = self.get_serializer(plans, many=True)
             return Response(serializer.data)
         return Response({'error': 'carrier_id parameter required'}, status=400)
 
-class EmployerViewSet(viewsets.ModelViewSet):
+class EmployerViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Employer.objects.all()
     serializer_class = EmployerSerializer
     
@@ -70,7 +172,7 @@ class EmployerViewSet(viewsets.ModelViewSet):
     def by_broker(self, request):
         broker_id = request.query_params.get('broker_id')
         if broker_id:
-            employers = Employer.objects.filter(broker_id=broker_id)
+            employers = self.get_queryset().filter(broker_id=broker_id)
             serializer = self.get_serializer(employers, many=True)
             return Response(serializer.data)
         return Response({'error': 'broker_id parameter required'}, status=400)
@@ -92,11 +194,19 @@ class EmployerViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            # Read file content
+            # Read the file a chunk at a time so large census files are not
+            # held in memory whole; xlsx cannot be chunk-read, so Excel files
+            # are capped in size and read as a single chunk
             if file_extension == 'csv':
-                df = pd.read_csv(file)
+                chunks = pd.read_csv(file, chunksize=EMPLOYEE_IMPORT_CHUNK_SIZE, dtype=str)
+            elif file.size > EMPLOYEE_IMPORT_MAX_EXCEL_BYTES:
+                return Response({
+                    'error': 'Excel file is too large. Please upload large files as CSV.'
+                }, status=status.HTTP_400_BAD_REQUEST)
             else:
-                df = pd.read_excel(file)
+                chunks = [pd.read_excel(file)]
+            chunks = iter(chunks)
+            df = next(chunks)
             
             # Validate required columns
             required_columns = [
@@ -116,59 +226,146 @@ class EmployerViewSet(viewsets.ModelViewSet):
             employees_updated = 0
             errors = []
             
-            for index, row in df.iterrows():
-                try:
-                    # Parse dates
-                    date_of_birth = pd.to_datetime(row['date_of_birth']).date()
-                    hire_date = pd.to_datetime(row['hire_date']).date()
-                    
-                    # Prepare employee data
-                    employee_data = {
-                        'employer': employer,
-                        'employee_id': str(row['employee_id']).strip(),
-                        'first_name': str(row['first_name']).strip(),
-                        'last_name': str(row['last_name']).strip(),
-                        'email': str(row['email']).strip(),
-                        'date_of_birth': date_of_birth,
-                        'gender': str(row.get('gender', 'M')).upper()[:1],
-                        'hire_date': hire_date,
-                        'middle_initial': str(row.get('middle_initial', '')).strip()[:1],
-                        'ssn': str(row.get('ssn', '')).strip(),
-                        'phone': str(row.get('phone', '')).strip(),
-                        'address_line1': str(row.get('address_line1', '')).strip(),
-                        'address_line2': str(row.get('address_line2', '')).strip(),
-                        'city': str(row.get('city', '')).strip(),
-                        'state': str(row.get('state', '')).strip()[:2],
-                        'zip_code': str(row.get('zip_code', '')).strip(),
-                        'job_title': str(row.get('job_title', '')).strip(),
-                        'department': str(row.get('department', '')).strip(),
-                        'salary': float(row.get('salary', 0)) if pd.notna(row.get('salary')) else 0,
-                        'hours_per_week': float(row.get('hours_per_week', 40)) if pd.notna(row.get('hours_per_week')) else 40,
-                        'employment_status': str(row.get('employment_status', 'active')).lower(),
-                        'marital_status': str(row.get('marital_status', 'single')).lower(),
-                        'medical_coverage_tier': str(row.get('medical_coverage_tier', '')).strip(),
-                        'dental_coverage_tier': str(row.get('dental_coverage_tier', '')).strip(),
-                        'vision_coverage_tier': str(row.get('vision_coverage_tier', '')).strip(),
-                    }
-                    
-                    # Create or update employee
-                    employee, created = Employee.objects.update_or_create(
-                        employer=employer,
-                        employee_id=employee_data['employee_id'],
-                        defaults=employee_data
-                    )
-                    
-                    if created:
-                        employees_created += 1
-                    else:
+            # Employees already on file, to tell creates from updates
+            existing_ids = set(
+                Employee.plain_objects.filter(employer=employer).values_list('employee_id', flat=True)
+            )
+            imported_ids = set()
+            
+            # Clean each column once per chunk; a missing column or blank cell
+            # takes the column's default
+            def text(column, default=''):
+                if column not in df.columns:
+                    return pd.Series(default, index=df.index, dtype=object)
+                values = df[column]
+                return values.where(values.notna(), default).astype(str).str.strip()
+            
+            def number(column, default):
+                if column not in df.columns:
+                    return pd.Series(default, index=df.index, dtype=float)
+                values = df[column]
+                # Non-numeric values stay NaN and are reported per row below
+                return pd.to_numeric(values, errors='coerce').where(values.notna(), default)
+            
+            def day(column):
+                return pd.to_datetime(df[column], errors='coerce', format='mixed').dt.date
+            
+            def upsert(batch):
+                Employee.plain_objects.bulk_create(
+                    [employee for _, employee in batch],
+                    update_conflicts=True,
+                    unique_fields=['employer', 'employee_id'],
+                    update_fields=update_fields
+                )
+            
+            def count_saved(batch):
+                nonlocal employees_created, employees_updated
+                for _, employee in batch:
+                    if employee.employee_id in existing_ids:
                         employees_updated += 1
-                        
-                except Exception as e:
-                    errors.append({
-                        'row': index + 2,  # +2 because pandas is 0-indexed and we skip header
-                        'employee_id': str(row.get('employee_id', '')),
-                        'error': str(e)
-                    })
+                    else:
+                        employees_created += 1
+                        existing_ids.add(employee.employee_id)
+                    imported_ids.add(employee.employee_id)
+            
+            for df in itertools.chain([df], chunks):
+                records = pd.DataFrame({
+                    'employee_id': text('employee_id'),
+                    'first_name': text('first_name'),
+                    'last_name': text('last_name'),
+                    'email': text('email'),
+                    'date_of_birth': day('date_of_birth'),
+                    'gender': text('gender', 'M').str.upper().str[:1],
+                    'hire_date': day('hire_date'),
+                    'middle_initial': text('middle_initial').str[:1],
+                    'ssn': text('ssn'),
+                    'phone': text('phone'),
+                    'address_line1': text('address_line1'),
+                    'address_line2': text('address_line2'),
+                    'city': text('city'),
+                    'state': text('state').str[:2],
+                    'zip_code': text('zip_code'),
+                    'job_title': text('job_title'),
+                    'department': text('department'),
+                    'salary': number('salary', 0),
+                    'hours_per_week': number('hours_per_week', 40),
+                    'employment_status': text('employment_status', 'active').str.lower(),
+                    'marital_status': text('marital_status', 'single').str.lower(),
+                    'medical_coverage_tier': text('medical_coverage_tier'),
+                    'dental_coverage_tier': text('dental_coverage_tier'),
+                    'vision_coverage_tier': text('vision_coverage_tier'),
+                })
+                update_fields = [column for column in records.columns if column != 'employee_id'] + ['updated_at']
+                
+                # One Employee per employee_id; a later row for the same employee
+                # replaces the earlier one, as successive update_or_create calls did
+                employees = {}
+                replaced_rows = 0
+                for index, employee_data in zip(df.index, records.to_dict('records')):
+                    # A blank employee_id would collapse onto one (employer, '') row
+                    blank = next(
+                        (column for column in ('employee_id', 'first_name', 'last_name')
+                         if not employee_data[column]),
+                        None
+                    )
+                    if blank:
+                        errors.append({
+                            'row': index + 2,
+                            'employee_id': employee_data['employee_id'],
+                            'error': f'Missing {blank}'
+                        })
+                        continue
+                    invalid = next(
+                        (column for column in ('date_of_birth', 'hire_date', 'salary', 'hours_per_week')
+                         if pd.isna(employee_data[column])),
+                        None
+                    )
+                    if invalid:
+                        errors.append({
+                            'row': index + 2,  # +2 because pandas is 0-indexed and we skip header
+                            'employee_id': employee_data['employee_id'],
+                            'error': f'Invalid {invalid}: {df.at[index, invalid]}'
+                        })
+                        continue
+                    if employee_data['employee_id'] in employees:
+                        replaced_rows += 1
+                    employees[employee_data['employee_id']] = (index, Employee(employer=employer, **employee_data))
+                
+                # Insert new employees and update existing ones in one statement per batch
+                rows = list(employees.values())
+                for start in range(0, len(rows), EMPLOYEE_IMPORT_BATCH_SIZE):
+                    batch = rows[start:start + EMPLOYEE_IMPORT_BATCH_SIZE]
+                    try:
+                        with transaction.atomic():
+                            upsert(batch)
+                        count_saved(batch)
+                    except DatabaseError:
+                        # Retry the batch a row at a time to report the rows the database rejects
+                        for row in batch:
+                            index, employee = row
+                            try:
+                                with transaction.atomic():
+                                    upsert([row])
+                                count_saved([row])
+                            except DatabaseError as e:
+                                errors.append({
+                                    'row': index + 2,
+                                    'employee_id': employee.employee_id,
+                                    'error': str(e)
+                                })
+                employees_updated += replaced_rows
+            errors.sort(key=lambda error: error['row'])
+            
+            # bulk_create sends no post_save, so refresh the linked portal users' sort_name here
+            portal_users = list(
+                EmployeePortalUser.objects.filter(
+                    employee__employer=employer,
+                    employee__employee_id__in=imported_ids
+                ).select_related('employee')
+            )
+            for portal_user in portal_users:
+                portal_user.sort_name = EmployeePortalUser.sort_name_for(portal_user.employee)
+            EmployeePortalUser.objects.bulk_update(portal_users, ['sort_name'])
             
             # Prepare response
             response_data = {
@@ -194,39 +391,11 @@ class EmployerViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def download_employee_template(self, request, pk=None):
         """Download CSV template for employee bulk import"""
-        template_data = {
-            'employee_id': ['EMP001', 'EMP002'],
-            'first_name': ['John', 'Jane'],
-            'last_name': ['Smith', 'Doe'],
-            'middle_initial': ['A', 'M'],
-            'email': ['john.smith@company.com', 'jane.doe@company.com'],
-            'ssn': ['123-45-6789', '987-65-4321'],
-            'date_of_birth': ['1985-03-15', '1990-07-22'],
-            'gender': ['M', 'F'],
-            'marital_status': ['married', 'single'],
-            'phone': ['555-123-4567', '555-987-6543'],
-            'address_line1': ['123 Main St', '456 Oak Ave'],
-            'address_line2': ['Apt 1', ''],
-            'city': ['Boston', 'Cambridge'],
-            'state': ['MA', 'MA'],
-            'zip_code': ['02101', '02139'],
-            'hire_date': ['2020-01-15', '2021-06-01'],
-            'job_title': ['Software Engineer', 'Product Manager'],
-            'department': ['Engineering', 'Product'],
-            'salary': [95000, 105000],
-            'hours_per_week': [40, 40],
-            'employment_status': ['active', 'active'],
-            'medical_coverage_tier': ['family', 'employee_only'],
-            'dental_coverage_tier': ['family', 'employee_only'],
-            'vision_coverage_tier': ['family', 'employee_only']
-        }
-        
-        df = pd.DataFrame(template_data)
-        
-        # Create CSV response
         response = HttpResponse(content_type='text/csv')
         response['Content-Disposition'] = f'attachment; filename="employee_import_template.csv"'
-        df.to_csv(response, index=False)
+        writer = csv.writer(response, lineterminator='\n')
+        writer.writerow(EMPLOYEE_TEMPLATE_HEADER)
+        writer.writerows(EMPLOYEE_TEMPLATE_ROWS)
         
         return response
     
@@ -235,56 +404,23 @@ class EmployerViewSet(viewsets.ModelViewSet):
         """Download the latest completed export for this employer"""
         employer = self.get_object()
         
-        # Get the latest completed export job for this employer
-        latest_export = ExportJob.objects.filter(
-            employer=employer,
-            status='completed'
-        ).order_by('-created_at').first()
-        
         # Always generate a current CSV export regardless of previous export jobs
+        fields = [field for _, field in CENSUS_CSV_COLUMNS]
+        writer = csv.writer(Echo())
+        rows = itertools.chain(
+            [writer.writerow([header for header, _ in CENSUS_CSV_COLUMNS])],
+            (
+                writer.writerow([getattr(emp, field) for field in fields])
+                for emp in employer.stream_census(fields)
+            )
+        )
         
-        # Generate CSV export of all employees for this employer
-        employees = Employee.objects.filter(employer=employer).select_related('employer')
-        
-        response = HttpResponse(content_type='text/csv')
+        response = StreamingHttpResponse(rows, content_type='text/csv')
         response['Content-Disposition'] = f'attachment; filename="{employer.name}_employees_export.csv"'
         
-        import csv
-        writer = csv.writer(response)
-        
-        # Write headers
-        writer.writerow([
-            'Employee ID', 'First Name', 'Last Name', 'Email', 'Phone',
-            'Date of Birth', 'SSN', 'Address', 'City', 'State', 'Zip',
-            'Hire Date', 'Job Title', 'Department', 'Salary', 'Hours per Week',
-            'Employment Status'
-        ])
-        
-        # Write employee data
-        for emp in employees:
-            writer.writerow([
-                emp.employee_id,
-                emp.first_name,
-                emp.last_name,
-                emp.email,
-                emp.phone,
-                emp.date_of_birth,
-                emp.ssn,
-                emp.address_line1,
-                emp.city,
-                emp.state,
-                emp.zip_code,
-                emp.hire_date,
-                emp.job_title,
-                emp.department,
-                emp.salary,
-                emp.hours_per_week,
-                emp.employment_status
-            ])
-        
         return response
 
-class EmployerOfferingViewSet(viewsets.ModelViewSet):
+class EmployerOfferingViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = EmployerOffering.objects.all()
     serializer_class = EmployerOfferingSerializer
     
@@ -292,12 +428,12 @@ class EmployerOfferingViewSet(viewsets.ModelViewSet):
     def by_employer(self, request):
         employer_id = request.query_params.get('employer_id')
         if employer_id:
-            offerings = EmployerOffering.objects.filter(employer_id=employer_id)
+            offerings = self.get_queryset().filter(employer_id=employer_id)
             serializer = self.get_serializer(offerings, many=True)
             return Response(serializer.data)
         return Response({'error': 'employer_id parameter required'}, status=400)
 
-class ExportJobViewSet(viewsets.ModelViewSet):
+class ExportJobViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = ExportJob.objects.all()
     serializer_class = ExportJobSerializer
     
@@ -312,7 +448,7 @@ class ExportJobViewSet(viewsets.ModelViewSet):
         
         try:
             employer = Employer.objects.get(id=employer_id)
-            aetna_carrier = Carrier.objects.get(name='Aetna')
+            aetna_carrier = carrier_by_name('Aetna')
             
             # Create export job
             export_job = ExportJob.objects.create(
@@ -328,7 +464,7 @@ class ExportJobViewSet(viewsets.ModelViewSet):
                 file_path = self._generate_aetna_excel(employer, coverage_type, export_job)
                 export_job.file_name = os.path.basename(file_path)
                 export_job.status = 'completed'
-                export_job.save()
+                export_job.save(update_fields=['file_name', 'status'])
                 
                 return Response({
                     'message': 'Aetna export generated successfully',
@@ -340,7 +476,7 @@ class ExportJobViewSet(viewsets.ModelViewSet):
             except Exception as e:
                 export_job.status = 'failed'
                 export_job.error_details = {'error': str(e)}
-                export_job.save()
+                export_job.save(update_fields=['status', 'error_details'])
                 return Response({
                     'error': f'Export generation failed: {str(e)}'
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -352,65 +488,57 @@ class ExportJobViewSet(viewsets.ModelViewSet):
     
     def _generate_aetna_excel(self, employer, coverage_type, export_job):
         """Generate Aetna-specific Excel file"""
-        # Get employees and their dependents
-        employees = Employee.objects.filter(employer=employer).prefetch_related('dependents')
-        
-        # Prepare data for Excel export
-        export_data = []
-        
-        for employee in employees:
-            # Employee row
-            employee_data = {
-                'Employee ID': employee.employee_id,
-                'First Name': employee.first_name,
-                'Last Name': employee.last_name,
-                'Middle Initial': employee.middle_initial,
-                'SSN': employee.ssn,
-                'Date of Birth': employee.date_of_birth.strftime('%m/%d/%Y') if employee.date_of_birth else '',
-                'Gender': employee.gender,
-                'Marital Status': employee.marital_status.title(),
-                'Email': employee.email,
-                'Phone': employee.phone,
-                'Address Line 1': employee.address_line1,
-                'Address Line 2': employee.address_line2,
-                'City': employee.city,
-                'State': employee.state,
-                'ZIP Code': employee.zip_code,
-                'Hire Date': employee.hire_date.strftime('%m/%d/%Y') if employee.hire_date else '',
-                'Job Title': employee.job_title,
-                'Department': employee.department,
-                'Annual Salary': float(employee.salary),
-                'Hours Per Week': float(employee.hours_per_week),
-                'Employment Status': employee.employment_status.title(),
-                'Coverage Tier': getattr(employee, f'{coverage_type}_coverage_tier', ''),
-                'Relationship': 'Employee',
-                'Dependent First Name': '',
-                'Dependent Last Name': '',
-                'Dependent DOB': '',
-                'Dependent Gender': '',
-                'Dependent SSN': ''
-            }
-            export_data.append(employee_data)
-            
-            # Dependent rows
-            for dependent in employee.dependents.all():
-                dependent_data = employee_data.copy()
-                dependent_data.update({
-                    'Relationship': dependent.relationship.title(),
-                    'Dependent First Name': dependent.first_name,
-                    'Dependent Last Name': dependent.last_name,
-                    'Dependent DOB': dependent.date_of_birth.strftime('%m/%d/%Y') if dependent.date_of_birth else '',
-                    'Dependent Gender': dependent.gender,
-                    'Dependent SSN': dependent.ssn
-                })
-                
-                # Only include if dependent has coverage for this type
-                coverage_field = f'{coverage_type}_coverage'
-                if hasattr(dependent, coverage_field) and getattr(dependent, coverage_field):
-                    export_data.append(dependent_data)
+        # Build the sheet a column at a time from values_list rows: one row per
+        # employee, followed by a copy of it for each dependent covered for
+        # this coverage type (plan types such as life have no dependent
+        # coverage flag, so they export employees only)
+        coverage_field = f'{coverage_type}_coverage'
+        tier_field = f'{coverage_type}_coverage_tier'
+        employee_fields = [field for _, field in AETNA_EMPLOYEE_COLUMNS]
+        if hasattr(Employee, tier_field):
+            employee_fields.append(tier_field)
+        employees = pd.DataFrame.from_records(
+            list(Employee.plain_objects.filter(employer=employer).values_list('pk', *employee_fields)),
+            columns=['pk', *employee_fields]
+        )
+        
+        def formatted_dates(values):
+            return pd.to_datetime(values).dt.strftime('%m/%d/%Y').fillna('')
         
-        # Create DataFrame and Excel file
-        df = pd.DataFrame(export_data)
+        export = pd.DataFrame({
+            header: employees[field] for header, field in AETNA_EMPLOYEE_COLUMNS
+        })
+        export['Date of Birth'] = formatted_dates(employees['date_of_birth'])
+        export['Hire Date'] = formatted_dates(employees['hire_date'])
+        export['Marital Status'] = employees['marital_status'].str.title()
+        export['Annual Salary'] = employees['salary'].astype(float)
+        export['Hours Per Week'] = employees['hours_per_week'].astype(float)
+        export['Employment Status'] = employees['employment_status'].str.title()
+        export['Coverage Tier'] = employees[tier_field] if tier_field in employees else ''
+        export['Relationship'] = 'Employee'
+        for header, _ in AETNA_DEPENDENT_COLUMNS[1:]:
+            export[header] = ''
+        
+        dependent_fields = [field for _, field in AETNA_DEPENDENT_COLUMNS]
+        if hasattr(Dependent, coverage_field):
+            dependent_rows = list(
+                Dependent.objects.filter(employee__employer=employer, **{coverage_field: True})
+                .order_by('relationship', 'last_name')
+                .values_list('employee', *dependent_fields)
+            )
+        else:
+            dependent_rows = []
+        dependents = pd.DataFrame.from_records(dependent_rows, columns=['employee', *dependent_fields])
+        
+        # Each dependent row repeats its employee's columns and keeps the
+        # employee's index, so a stable sort on the index puts it under them
+        position = pd.Series(range(len(employees)), index=employees['pk'])
+        dependent_export = export.iloc[position[dependents['employee']].to_numpy()].copy()
+        for header, field in AETNA_DEPENDENT_COLUMNS:
+            dependent_export[header] = dependents[field].to_numpy()
+        dependent_export['Relationship'] = dependent_export['Relationship'].str.title()
+        dependent_export['Dependent DOB'] = formatted_dates(dependent_export['Dependent DOB'])
+        df = pd.concat([export, dependent_export]).sort_index(kind='stable').reset_index(drop=True)
         
         # Create exports directory if it doesn't exist
         exports_dir = os.path.join(settings.MEDIA_ROOT, 'exports')
@@ -420,37 +548,37 @@ class ExportJobViewSet(viewsets.ModelViewSet):
         filename = f"Aetna_{employer.name.replace(' ', '_')}_{coverage_type}_{date.today().strftime('%Y%m%d')}_{str(uuid.uuid4())[:8]}.xlsx"
         file_path = os.path.join(exports_dir, filename)
         
-        # Write to Excel with Aetna-specific formatting
-        with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Census Data', index=False)
-            
-            # Get the workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Census Data']
-            
-            # Format headers
-            from openpyxl.styles import Font, PatternFill, Alignment
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="0066CC", end_color="0066CC", fill_type="solid")
-            
-            for col_num, column_title in enumerate(df.columns, 1):
-                cell = worksheet.cell(row=1, column=col_num)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = Alignment(horizontal="center")
-                
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column = [cell for cell in column]
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
+        # Write to Excel with Aetna-specific formatting, streaming rows
+        # through a write-only workbook
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet('Census Data')
+        
+        # Size each column to its longest value (header included), capped at
+        # 50; widths must be set before the first row is written
+        for col_num, column_title in enumerate(df.columns, 1):
+            max_length = max([len(column_title), *df[column_title].astype(str).str.len()])
+            worksheet.column_dimensions[get_column_letter(col_num)].width = min(max_length + 2, 50)
+        
+        # Format headers
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="0066CC", end_color="0066CC", fill_type="solid")
+        header_alignment = Alignment(horizontal="center")
+        header = []
+        for column_title in df.columns:
+            cell = WriteOnlyCell(worksheet, value=column_title)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            header.append(cell)
+        worksheet.append(header)
+        
+        for row in df.itertuples(index=False, name=None):
+            worksheet.append(row)
+        workbook.save(file_path)
         
         return file_path
     
@@ -462,16 +590,19 @@ class ExportJobViewSet(viewsets.ModelViewSet):
             file_path = os.path.join(settings.MEDIA_ROOT, 'exports', export_job.file_name)
             
             if os.path.exists(file_path):
-                with open(file_path, 'rb') as f:
-                    response = HttpResponse(f.read(), content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-                    response['Content-Disposition'] = f'attachment; filename="{export_job.file_name}"'
-                    return response
+                # FileResponse streams the file (sendfile via wsgi.file_wrapper where available)
+                return FileResponse(
+                    open(file_path, 'rb'),
+                    as_attachment=True,
+                    filename=export_job.file_name,
+                    content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+                )
             else:
                 return Response({'error': 'File not found'}, status=status.HTTP_404_NOT_FOUND)
         
         return Response({'error': 'Export not ready'}, status=status.HTTP_400_BAD_REQUEST)
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
     
@@ -484,12 +615,12 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     def by_employer(self, request):
         employer_id = request.query_params.get('employer_id')
         if employer_id:
-            employees = Employee.objects.filter(employer_id=employer_id)
+            employees = self.get_queryset().filter(employer_id=employer_id)
             serializer = self.get_serializer(employees, many=True)
             return Response(serializer.data)
         return Response({'error': 'employer_id parameter required'}, status=400)
 
-class DependentViewSet(viewsets.ModelViewSet):
+class DependentViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Dependent.objects.all()
     serializer_class = DependentSerializer
     
@@ -497,12 +628,12 @@ class DependentViewSet(viewsets.ModelViewSet):
     def by_employee(self, request):
         employee_id = request.query_params.get('employee_id')
         if employee_id:
-            dependents = Dependent.objects.filter(employee_id=employee_id)
+            dependents = self.get_queryset().filter(employee_id=employee_id)
             serializer = self.get_serializer(dependents, many=True)
             return Response(serializer.data)
         return Response({'error': 'employee_id parameter required'}, status=400)
 
-class EnrollmentPeriodViewSet(viewsets.ModelViewSet):
+class EnrollmentPeriodViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = EnrollmentPeriod.objects.all()
     serializer_class = EnrollmentPeriodSerializer
     
@@ -515,7 +646,7 @@ class EnrollmentPeriodViewSet(viewsets.ModelViewSet):
     def by_employer(self, request):
         employer_id = request.query_params.get('employer_id')
         if employer_id:
-            periods = EnrollmentPeriod.objects.filter(employer_id=employer_id)
+            periods = self.get_queryset().filter(employer_id=employer_id)
             serializer = self.get_serializer(periods, many=True)
             return Response(serializer.data)
         return Response({'error': 'employer_id parameter required'}, status=400)
@@ -523,7 +654,7 @@ class EnrollmentPeriodViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def active(self, request):
         """Get active enrollment periods"""
-        active_periods = EnrollmentPeriod.objects.filter(
+        active_periods = self.get_queryset().filter(
             status='active',
             start_date__lte=date.today(),
             end_date__gte=date.today()
@@ -531,7 +662,7 @@ class EnrollmentPeriodViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(active_periods, many=True)
         return Response(serializer.data)
 
-class EmployeeEnrollmentViewSet(viewsets.ModelViewSet):
+class EmployeeEnrollmentViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = EmployeeEnrollment.objects.all()
     serializer_class = EmployeeEnrollmentSerializer
     
@@ -546,7 +677,7 @@ class EmployeeEnrollmentViewSet(viewsets.ModelViewSet):
     def by_employee(self, request):
         employee_id = request.query_params.get('employee_id')
         if employee_id:
-            enrollments = EmployeeEnrollment.objects.filter(employee_id=employee_id)
+            enrollments = self.get_queryset().filter(employee_id=employee_id)
             serializer = self.get_serializer(enrollments, many=True)
             return Response(serializer.data)
         return Response({'error': 'employee_id parameter required'}, status=400)
@@ -555,7 +686,7 @@ class EmployeeEnrollmentViewSet(viewsets.ModelViewSet):
     def by_period(self, request):
         period_id = request.query_params.get('period_id')
         if period_id:
-            enrollments = EmployeeEnrollment.objects.filter(enrollment_period_id=period_id)
+            enrollments = self.get_queryset().filter(enrollment_period_id=period_id)
             serializer = self.get_serializer(enrollments, many=True)
             return Response(serializer.data)
         return Response({'error': 'period_id parameter required'}, status=400)
@@ -565,19 +696,33 @@ class EmployeeEnrollmentViewSet(viewsets.ModelViewSet):
         """Get enrollment summary by period"""
         period_id = request.query_params.get('period_id')
         if period_id:
-            enrollments = EmployeeEnrollment.objects.filter(enrollment_period_id=period_id)
+            enrollments = self.get_queryset().filter(enrollment_period_id=period_id)
             serializer = EmployeeEnrollmentSummarySerializer(enrollments, many=True)
             return Response(serializer.data)
         return Response({'error': 'period_id parameter required'}, status=400)
     
+    def _transition(self, from_status, to_status, **changes):
+        """
+        Move this enrollment from from_status to to_status with one
+        conditional UPDATE, so concurrent requests can't both make the same
+        transition. Returns the updated enrollment, or None if it was not in
+        from_status.
+        """
+        # Scoped and permission-checked first; 404s for unknown pks
+        enrollment = self.get_object()
+        updated = EmployeeEnrollment.plain_objects.filter(
+            pk=enrollment.pk, status=from_status
+        ).update(status=to_status, updated_at=timezone.now(), **changes)
+        if not updated:
+            return None
+        enrollment.refresh_from_db()
+        return enrollment
+    
     @action(detail=True, methods=['post'])
     def start_enrollment(self, request, pk=None):
         """Start an employee's enrollment process"""
-        enrollment = self.get_object()
-        if enrollment.status == 'not_started':
-            enrollment.status = 'in_progress'
-            enrollment.started_at = datetime.now()
-            enrollment.save()
+        enrollment = self._transition('not_started', 'in_progress', started_at=timezone.now())
+        if enrollment:
             serializer = self.get_serializer(enrollment)
             return Response(serializer.data)
         return Response({'error': 'Enrollment already started'}, status=400)
@@ -585,12 +730,8 @@ class EmployeeEnrollmentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def submit_enrollment(self, request, pk=None):
         """Submit an employee's enrollment for approval"""
-        enrollment = self.get_object()
-        if enrollment.status == 'in_progress':
-            enrollment.status = 'submitted'
-            enrollment.submitted_at = datetime.now()
-            enrollment.save()
-            
+        enrollment = self._transition('in_progress', 'submitted', submitted_at=timezone.now())
+        if enrollment:
             # Create enrollment event
             EnrollmentEvent.objects.create(
                 employee=enrollment.employee,
@@ -606,25 +747,28 @@ class EmployeeEnrollmentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def approve_enrollment(self, request, pk=None):
         """Approve an employee's enrollment"""
-        enrollment = self.get_object()
-        if enrollment.status == 'submitted':
-            enrollment.status = 'approved'
-            enrollment.approved_at = datetime.now()
-            enrollment.approved_by = request.user
-            enrollment.save()
+        enrollment = self._transition(
+            'submitted', 'approved', approved_at=timezone.now(), approved_by=request.user
+        )
+        if enrollment:
             serializer = self.get_serializer(enrollment)
             return Response(serializer.data)
         return Response({'error': 'Enrollment cannot be approved'}, status=400)
 
-class PlanEnrollmentViewSet(viewsets.ModelViewSet):
+class PlanEnrollmentViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = PlanEnrollment.objects.all()
     serializer_class = PlanEnrollmentSerializer
     
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return PlanEnrollmentDetailSerializer
+        return PlanEnrollmentSerializer
+    
     @action(detail=False, methods=['get'])
     def by_employee_enrollment(self, request):
         enrollment_id = request.query_params.get('enrollment_id')
         if enrollment_id:
-            plan_enrollments = PlanEnrollment.objects.filter(employee_enrollment_id=enrollment_id)
+            plan_enrollments = self.get_queryset().filter(employee_enrollment_id=enrollment_id)
             serializer = self.get_serializer(plan_enrollments, many=True)
             return Response(serializer.data)
         return Response({'error': 'enrollment_id parameter required'}, status=400)
@@ -633,7 +777,7 @@ class PlanEnrollmentViewSet(viewsets.ModelViewSet):
     def by_plan(self, request):
         plan_id = request.query_params.get('plan_id')
         if plan_id:
-            plan_enrollments = PlanEnrollment.objects.filter(plan_id=plan_id, status='enrolled')
+            plan_enrollments = self.get_queryset().filter(plan_id=plan_id, status='enrolled')
             serializer = self.get_serializer(plan_enrollments, many=True)
             return Response(serializer.data)
         return Response({'error': 'plan_id parameter required'}, status=400)
@@ -665,7 +809,7 @@ class PlanEnrollmentViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(plan_enrollment)
         return Response(serializer.data)
 
-class EnrollmentEventViewSet(viewsets.ModelViewSet):
+class EnrollmentEventViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = EnrollmentEvent.objects.all()
     serializer_class = EnrollmentEventSerializer
     
@@ -673,7 +817,7 @@ class EnrollmentEventViewSet(viewsets.ModelViewSet):
     def by_employee(self, request):
         employee_id = request.query_params.get('employee_id')
         if employee_id:
-            events = EnrollmentEvent.objects.filter(employee_id=employee_id)
+            events = self.get_queryset().filter(employee_id=employee_id)
             serializer = self.get_serializer(events, many=True)
             return Response(serializer.data)
         return Response({'error': 'employee_id parameter required'}, status=400)
@@ -683,11 +827,11 @@ class EnrollmentEventViewSet(viewsets.ModelViewSet):
         """Get recent enrollment events (last 30 days)"""
         from datetime import timedelta
         thirty_days_ago = date.today() - timedelta(days=30)
-        events = EnrollmentEvent.objects.filter(effective_date__gte=thirty_days_ago)
+        events = self.get_queryset().filter(effective_date__gte=thirty_days_ago)
         serializer = self.get_serializer(events, many=True)
         return Response(serializer.data)
 
-class EmployeeFormSubmissionViewSet(viewsets.ModelViewSet):
+class EmployeeFormSubmissionViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = EmployeeFormSubmission.objects.all()
     serializer_class = EmployeeFormSubmissionSerializer
     
@@ -696,11 +840,22 @@ class EmployeeFormSubmissionViewSet(viewsets.ModelViewSet):
             return EmployeeFormSubmissionListSerializer
         return EmployeeFormSubmissionSerializer
     
+    def list(self, request, *args, **kwargs):
+        # Every list field is a plain column, so read the rows as dicts rather
+        # than building and serializing a model instance per submission
+        queryset = self.filter_queryset(self.get_queryset()).annotate(
+            employer_name=F('employer__name')
+        ).values(*EmployeeFormSubmissionListSerializer.Meta.fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
+    
     @action(detail=False, methods=['get'])
     def by_employer(self, request):
         employer_id = request.query_params.get('employer_id')
         if employer_id:
-            submissions = EmployeeFormSubmission.objects.filter(employer_id=employer_id)
+            submissions = self.get_queryset().filter(employer_id=employer_id)
             serializer = self.get_serializer(submissions, many=True)
             return Response(serializer.data)
         return Response({'error': 'employer_id parameter required'}, status=400)
@@ -746,7 +901,7 @@ class EmployeeFormSubmissionViewSet(viewsets.ModelViewSet):
             submission.reviewed_at = timezone.now()
             submission.created_employee = employee
             submission.notes = request.data.get('notes', '')
-            submission.save()
+            submission.save(update_fields=['status', 'reviewed_by', 'reviewed_at', 'created_employee', 'notes'])
             
             return Response({
                 'message': 'Form submission approved and employee created',
@@ -770,7 +925,7 @@ class EmployeeFormSubmissionViewSet(viewsets.ModelViewSet):
         submission.reviewed_by = request.user if request.user.is_authenticated else None
         submission.reviewed_at = timezone.now()
         submission.notes = request.data.get('notes', '')
-        submission.save()
+        submission.save(update_fields=['status', 'reviewed_by', 'reviewed_at', 'notes'])
         
         return Response({'message': 'Form submission rejected'})
     
@@ -787,16 +942,21 @@ class EmployeeFormSubmissionViewSet(viewsets.ModelViewSet):
         submission.reviewed_by = request.user if request.user.is_authenticated else None
         submission.reviewed_at = timezone.now()
         submission.notes = request.data.get('notes', '')
-        submission.save()
+        submission.save(update_fields=['status', 'reviewed_by', 'reviewed_at', 'notes'])
         
         return Response({'message': 'Changes requested for form submission'})
 
-class EmployeePortalViewSet(viewsets.ModelViewSet):
+class EmployeePortalViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = EmployeePortalUser.objects.all()
     serializer_class = EmployeePortalUserSerializer
     authentication_classes = []  # Bypass DRF auth for custom employee portal auth
     permission_classes = []
     
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return EmployeePortalUserDetailSerializer
+        return EmployeePortalUserSerializer
+    
     @action(detail=False, methods=['post'])
     def register(self, request):
         """Register a new employee portal user"""
@@ -810,10 +970,7 @@ class EmployeePortalViewSet(viewsets.ModelViewSet):
             if EmployeePortalUser.objects.filter(email=email).exists():
                 return Response({'error': 'User with this email already exists'}, status=400)
             
-            # Create portal user
-            portal_user = EmployeePortalUser.objects.create(
-                email=email
-            )
+            portal_user = EmployeePortalUser(email=email)
             portal_user.set_password(password)
             
             # Link to form submission if provided
@@ -824,12 +981,18 @@ class EmployeePortalViewSet(viewsets.ModelViewSet):
                 except EmployeeFormSubmission.DoesNotExist:
                     return Response({'error': 'Form submission not found or email mismatch'}, status=400)
             
-            portal_user.save()
-            
-            # Generate verification token
-            import secrets
-            portal_user.email_verification_token = secrets.token_urlsafe(32)
-            portal_user.save()
+            # Only the token's digest is stored, so the raw token is emailed
+            # now; the user is rolled back if the email can't be sent
+            with transaction.atomic():
+                raw_token = portal_user.set_email_verification_token()
+                portal_user.save()
+                send_mail(
+                    'Verify your employee portal email',
+                    f'Your email verification token is: {raw_token}\n\n'
+                    f'Submit it with your user ID {portal_user.id} to verify your email address.',
+                    settings.DEFAULT_FROM_EMAIL,
+                    [portal_user.email]
+                )
             
             return Response({
                 'message': 'Registration successful',
@@ -849,7 +1012,9 @@ class EmployeePortalViewSet(viewsets.ModelViewSet):
             password = serializer.validated_data['password']
             
             try:
-                portal_user = EmployeePortalUser.objects.get(email=email)
+                portal_user = EmployeePortalUser.objects.select_related(
+                    'employee', 'form_submission'
+                ).get(email=email)
                 if not portal_user.is_active:
                     return Response({'error': 'Account is disabled'}, status=400)
                 
@@ -857,7 +1022,7 @@ class EmployeePortalViewSet(viewsets.ModelViewSet):
                     # Update last login
                     from django.utils import timezone
                     portal_user.last_login = timezone.now()
-                    portal_user.save()
+                    portal_user.save(update_fields=['last_login'])
                     
                     # Generate session token (simple implementation)
                     import secrets, jwt
@@ -901,8 +1066,10 @@ class EmployeePortalViewSet(viewsets.ModelViewSet):
             payload = jwt.decode(token, getattr(settings, 'SECRET_KEY', 'fallback-secret'), algorithms=['HS256'])
             user_id = payload['user_id']
             
-            portal_user = EmployeePortalUser.objects.get(id=user_id)
-            serializer = EmployeePortalUserSerializer(portal_user)
+            portal_user = EmployeePortalUserDetailSerializer.setup_eager_loading(
+                EmployeePortalUser.objects.all()
+            ).get(id=user_id)
+            serializer = EmployeePortalUserDetailSerializer(portal_user)
             return Response(serializer.data)
             
         except (jwt.InvalidTokenError, EmployeePortalUser.DoesNotExist):
@@ -914,14 +1081,52 @@ class EmployeePortalViewSet(viewsets.ModelViewSet):
         portal_user = self.get_object()
         token = request.data.get('token')
         
-        if portal_user.email_verification_token == token:
+        if portal_user.check_email_verification_token(token):
             portal_user.email_verified = True
             portal_user.email_verification_token = ''
-            portal_user.save()
+            portal_user.save(update_fields=['email_verified', 'email_verification_token'])
             return Response({'message': 'Email verified successfully'})
         
         return Response({'error': 'Invalid verification token'}, status=400)
     
+    @action(detail=False, methods=['post'])
+    def request_password_reset(self, request):
+        """Email a password reset token to an active portal user"""
+        email = request.data.get('email')
+        portal_user = EmployeePortalUser.objects.filter(email=email, is_active=True).first() if email else None
+        if portal_user:
+            with transaction.atomic():
+                raw_token = portal_user.set_password_reset_token()
+                portal_user.save(update_fields=['password_reset_token', 'password_reset_expires'])
+                send_mail(
+                    'Reset your employee portal password',
+                    f'Your password reset token is: {raw_token}\n\nIt expires in one hour.',
+                    settings.DEFAULT_FROM_EMAIL,
+                    [portal_user.email]
+                )
+        
+        # Same response either way so the endpoint doesn't reveal which emails are registered
+        return Response({'message': 'If an account exists for this email, a reset token has been sent'})
+    
+    @action(detail=False, methods=['post'])
+    def reset_password(self, request):
+        """Set a new password using a password reset token"""
+        portal_user = EmployeePortalUser.for_password_reset_token(request.data.get('token'))
+        new_password = request.data.get('new_password') or ''
+        
+        if portal_user is None:
+            return Response({'error': 'Invalid or expired reset token'}, status=400)
+        
+        if len(new_password) < 8:
+            return Response({'error': 'New password must be at least 8 characters'}, status=400)
+        
+        portal_user.set_password(new_password)
+        portal_user.password_reset_token = ''
+        portal_user.password_reset_expires = None
+        portal_user.save(update_fields=['password_hash', 'password_reset_token', 'password_reset_expires'])
+        
+        return Response({'message': 'Password reset successfully'})
+    
     @action(detail=True, methods=['post'])
     def change_password(self, request, pk=None):
         """Change user password"""
@@ -936,6 +1141,6 @@ class EmployeePortalViewSet(viewsets.ModelViewSet):
             return Response({'error': 'New password must be at least 8 characters'}, status=400)
         
         portal_user.set_password(new_password)
-        portal_user.save()
+        portal_user.save(update_fields=['password_hash'])
         
         return Response({'message': 'Password changed successfully'})
@@ -73,6 +73,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.audit.AuditBufferMiddleware',  # Batched, post-response audit writes
     'allauth.account.middleware.AccountMiddleware',
     'axes.middleware.AxesMiddleware',  # Brute force protection
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -93,6 +94,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'django.template.context_processors.media',
+                'accounts.context_processors.user_group_names',
             ],
         },
     },
@@ -112,6 +114,27 @@ DATABASES = {
 }
 
 
+# Cache
+# Per-process memory cache by default. Set REDIS_URL (requires the redis
+# package) so cached data and invalidations are shared across workers.
+
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# Seconds cached user permissions and group IDs are served before being
+# reloaded. The invalidation signals only clear the cache they can reach, so
+# with the per-process default another worker can keep serving a revoked
+# permission until its entry expires; keep that window short unless the
+# cache is shared.
+USER_PERMISSIONS_CACHE_TIMEOUT = 300 if REDIS_URL else 30
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 